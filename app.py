@@ -13,6 +13,7 @@ from __future__ import annotations
 
 import calendar
 import csv
+import heapq
 import secrets
 import shutil
 import sqlite3
@@ -24,10 +25,11 @@ from decimal import Decimal, InvalidOperation, ROUND_HALF_UP
 from io import StringIO
 from pathlib import Path
 from typing import Dict, List, Tuple
+import numpy as np
 import pandas as pd
 from sqlalchemy.exc import IntegrityError
-from sqlalchemy import or_, and_, func, case
-from sqlalchemy.orm import joinedload
+from sqlalchemy import Float, cast, event, or_, and_, func, case, exists, literal_column, select, tuple_
+from sqlalchemy.orm import Session, joinedload, load_only, raiseload, selectinload
 
 from flask import (
     Flask,
@@ -42,9 +44,13 @@ from flask import (
     current_app,
     send_from_directory,
     has_app_context,
+    g,
 )
 
-from functools import wraps
+from flask.json.provider import DefaultJSONProvider
+from functools import lru_cache, wraps
+from operator import attrgetter, itemgetter
+from jinja2 import FileSystemBytecodeCache
 from werkzeug.security import generate_password_hash, check_password_hash
 
 from models import (
@@ -59,9 +65,15 @@ from models import (
     BlockedDay,
     Notification,
     ApprovalAutomation,
+    EmployeeGroupOrder,
 )
 from auto_schedule import create_default_shifts_for_month, create_default_shifts_for_employee_position
 
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optionale Abhängigkeit
+    orjson = None
+
 LEAVE_TYPES_EXCLUDED_FROM_PRODUCTIVITY = {"Urlaub", "Krank"}
 
 DEFAULT_GROUP_ICONS = {
@@ -86,6 +98,29 @@ _COLOR_PALETTE = [
 ]
 
 
+class _ORJSONProvider(DefaultJSONProvider):
+    """JSON-Provider auf Basis von orjson für ``jsonify`` und den ``tojson``-Filter.
+
+    Nicht nativ unterstützte Werte (Datumswerte, Decimal, ``__html__``) laufen
+    wie bisher über die Standardumwandlung von Flask.
+    """
+
+    def dumps(self, obj, **kwargs) -> str:
+        option = orjson.OPT_NON_STR_KEYS | orjson.OPT_PASSTHROUGH_DATETIME
+        if kwargs.get("sort_keys", self.sort_keys):
+            option |= orjson.OPT_SORT_KEYS
+        if kwargs.get("indent"):
+            option |= orjson.OPT_INDENT_2
+        return orjson.dumps(
+            obj, default=kwargs.get("default", self.default), option=option
+        ).decode()
+
+    def loads(self, s, **kwargs):
+        if kwargs:
+            return super().loads(s, **kwargs)
+        return orjson.loads(s)
+
+
 def _format_file_size(num_bytes: int | None) -> str:
     """Wandelt eine Dateigröße in ein gut lesbares Format um."""
 
@@ -107,6 +142,47 @@ def _format_file_size(num_bytes: int | None) -> str:
     return f"{num_bytes} B"
 
 
+def _format_date(value: date) -> str:
+    """Formatiert ein Datum als ``TT.MM.JJJJ`` ohne Umweg über ``strftime``."""
+
+    return f"{value.day:02d}.{value.month:02d}.{value.year}"
+
+
+def _format_day_month(value: date) -> str:
+    """Formatiert ein Datum als ``TT.MM.`` ohne Umweg über ``strftime``."""
+
+    return f"{value.day:02d}.{value.month:02d}."
+
+
+_CALENDAR = calendar.Calendar(firstweekday=0)
+
+
+@lru_cache(maxsize=64)
+def _month_days(year: int, month: int) -> Tuple[date, ...]:
+    """Liefert alle Tage des angegebenen Monats in aufsteigender Reihenfolge."""
+
+    return tuple(d for d in _CALENDAR.itermonthdates(year, month) if d.month == month)
+
+
+_GERMAN_MONTH_NAMES = (
+    "Januar", "Februar", "März", "April", "Mai", "Juni",
+    "Juli", "August", "September", "Oktober", "November", "Dezember",
+)
+
+
+@lru_cache(maxsize=4)
+def _trailing_12_months(year: int, month: int) -> Tuple[Tuple[int, int, str], ...]:
+    """Liefert ``(Jahr, Monat, Bezeichnung)`` der letzten zwölf Monate, ältester zuerst."""
+
+    # Fortlaufender Monatsindex (Jahr * 12 + Monat - 1); // und % ersetzen jede
+    # Fallunterscheidung beim Jahreswechsel.
+    first_index = year * 12 + month - 12
+    return tuple(
+        (index // 12, index % 12 + 1, f"{_GERMAN_MONTH_NAMES[index % 12]} {index // 12}")
+        for index in range(first_index, first_index + 12)
+    )
+
+
 def _get_sqlite_database_path() -> Path | None:
     """Ermittelt den absoluten Pfad zur SQLite-Datenbank, sofern vorhanden."""
 
@@ -122,6 +198,32 @@ def _get_sqlite_database_path() -> Path | None:
     return db_file_path
 
 
+# Gültigkeitsdauer (Sekunden) der zwischengespeicherten Größe der Datenbankdatei
+_DB_FILE_SIZE_TTL = 30
+
+
+def _get_database_file_size(db_file_path: Path) -> str:
+    """Liefert die formatierte Größe der Datenbankdatei.
+
+    Der Wert wird je Datenstand höchstens ``_DB_FILE_SIZE_TTL`` Sekunden
+    wiederverwendet, damit nicht jeder Seitenaufruf die Datei abfragt.
+    """
+
+    ttl_window = int(time_module.monotonic() // _DB_FILE_SIZE_TTL)
+    return _load_database_file_size(str(db_file_path), _data_version, ttl_window)
+
+
+@lru_cache(maxsize=4)
+def _load_database_file_size(path: str, version: int, ttl_window: int) -> str:
+    """Liest die Dateigröße mit einem einzigen ``stat``-Aufruf."""
+
+    try:
+        size = Path(path).stat().st_size
+    except FileNotFoundError:
+        return "Datei nicht gefunden"
+    return _format_file_size(size)
+
+
 def _get_backup_directory() -> Path:
     """Gibt das Verzeichnis für Datenbanksicherungen zurück."""
 
@@ -166,6 +268,39 @@ def _create_sqlite_backup(source: Path, destination: Path) -> None:
             source_conn.backup(dest_conn)
 
 
+def _ensure_sqlite_columns(
+    cursor: sqlite3.Cursor, table: str, definitions: Dict[str, str]
+) -> None:
+    """Legt fehlende Spalten einer SQLite-Tabelle mit einem PRAGMA-Aufruf an.
+
+    Alle fehlenden Spalten werden gemeinsam in einer Transaktion ergänzt.
+    Schlägt das gebündelte Skript fehl, werden die Anweisungen einzeln
+    ausgeführt, damit eine inkompatible Spalte die übrigen nicht blockiert.
+    """
+
+    cursor.execute(f"PRAGMA table_info({table});")
+    existing_columns = {row[1] for row in cursor.fetchall()}
+    missing_statements = [
+        statement for column, statement in definitions.items() if column not in existing_columns
+    ]
+    if not missing_statements:
+        return
+
+    try:
+        cursor.executescript(
+            "BEGIN;\n" + ";\n".join(missing_statements) + ";\nCOMMIT;"
+        )
+    except sqlite3.Error:
+        if cursor.connection.in_transaction:
+            cursor.connection.rollback()
+        for statement in missing_statements:
+            try:
+                cursor.execute(statement)
+            except sqlite3.Error:
+                pass
+        cursor.connection.commit()
+
+
 def _create_default_admin_account() -> None:
     """Stellt sicher, dass ein Standard-Administrator existiert."""
 
@@ -204,6 +339,7 @@ def _create_default_admin_account() -> None:
     db.session.commit()
 
 
+@lru_cache(maxsize=512)
 def _normalize_hex_color(value: str | None) -> str | None:
     """Normalisiert einen Hex-Farbwert in die Form #rrggbb."""
 
@@ -245,6 +381,7 @@ def _hex_to_rgb(color: str | None) -> Tuple[int, int, int] | None:
         return None
 
 
+@lru_cache(maxsize=512)
 def _lighten_hex(color: str, factor: float) -> str:
     """Erzeugt eine hellere Variante des gegebenen Farbtons."""
 
@@ -261,6 +398,7 @@ def _lighten_hex(color: str, factor: float) -> str:
     return f"#{_lighten_component(r):02x}{_lighten_component(g):02x}{_lighten_component(b):02x}"
 
 
+@lru_cache(maxsize=512)
 def _get_contrast_text_color(color: str) -> str:
     """Ermittelt eine gut lesbare Textfarbe für den angegebenen Hintergrund."""
 
@@ -273,6 +411,7 @@ def _get_contrast_text_color(color: str) -> str:
     return "#111827" if luminance > 0.6 else "#ffffff"
 
 
+@lru_cache(maxsize=512)
 def _color_from_name(name: str | None) -> str:
     """Wählt einen konsistenten Farbwert anhand eines Namens."""
 
@@ -310,31 +449,164 @@ def _build_group_meta(name: str, base_color: str | None = None) -> Dict[str, str
     }
 
 
+# Datenstand der Anwendung. Jeder Commit erhöht ihn und verwirft damit alle
+# Zwischenspeicher, die ihn als Schlüssel verwenden.
+_data_version = 0
+
+
+@event.listens_for(Session, "after_commit")
+def _bump_data_version(_session) -> None:
+    """Markiert nach jedem Commit alle vom Datenstand abhängigen Zwischenspeicher als veraltet."""
+
+    global _data_version
+    _data_version += 1
+
+
+@lru_cache(maxsize=64)
+def _load_employee_positions(
+    database_url: str, version: int, department_id: int | None
+) -> Tuple[str, ...]:
+    """Lädt die vergebenen Positionen; Ergebnis gilt je Datenbank, Datenstand und Abteilung."""
+
+    query = (
+        db.session.query(Employee.position)
+        .filter(Employee.position.isnot(None))
+        .filter(Employee.position != "")
+    )
+    if department_id:
+        query = query.filter(Employee.department_id == department_id)
+    return tuple(value for (value,) in query.distinct().order_by(Employee.position).all())
+
+
+def _get_employee_positions(department_id: int | None = None) -> List[str]:
+    """Liefert die sortierten, nicht leeren Positionen der Mitarbeiter.
+
+    Mit ``department_id`` werden nur Positionen dieser Abteilung berücksichtigt.
+    """
+
+    return list(
+        _load_employee_positions(str(db.engine.url), _data_version, department_id or None)
+    )
+
+
+@lru_cache(maxsize=1)
+def _load_department_options(database_url: str, version: int) -> Tuple[Dict[str, object], ...]:
+    """Lädt Kennung und Namen aller Abteilungen, sortiert nach Namen."""
+
+    return tuple(
+        {"id": department_id, "name": name}
+        for department_id, name in (
+            db.session.query(Department.id, Department.name).order_by(Department.name).all()
+        )
+    )
+
+
+def _get_department_options() -> List[Dict[str, object]]:
+    """Liefert die Abteilungen für Auswahllisten als einfache Einträge."""
+
+    return list(_load_department_options(str(db.engine.url), _data_version))
+
+
+@lru_cache(maxsize=1)
+def _load_productivity_settings(
+    database_url: str, version: int
+) -> Tuple[Tuple[int | None, float], ...]:
+    """Lädt Abteilung und Wert aller aktiven Produktivitätseinstellungen."""
+
+    return tuple(
+        db.session.query(
+            ProductivitySettings.department_id, ProductivitySettings.productivity_value
+        )
+        .filter(ProductivitySettings.is_active == True)
+        .order_by(ProductivitySettings.id)
+        .all()
+    )
+
+
+def _get_productivity_settings() -> Dict[object, float]:
+    """Liefert die aktiven Produktivitätswerte je Abteilungs-ID bzw. unter ``'global'``."""
+
+    productivity_settings: Dict[object, float] = {}
+    for department_id, value in _load_productivity_settings(str(db.engine.url), _data_version):
+        productivity_settings[department_id or "global"] = value
+    return productivity_settings
+
+
+def _clear_default_work_classes(keep_id: int | None = None) -> None:
+    """Entfernt die Standardmarkierung aller übrigen Arbeitsklassen mit einem UPDATE."""
+
+    query = WorkClass.query.filter(WorkClass.is_default.is_(True))
+    if keep_id is not None:
+        query = query.filter(WorkClass.id != keep_id)
+    query.update({"is_default": False}, synchronize_session=False)
+
+
+@lru_cache(maxsize=1)
+def _load_work_classes(database_url: str, version: int) -> Tuple[Tuple[str, str | None], ...]:
+    """Lädt Name und Farbe aller Arbeitsklassen, Standardklasse zuerst."""
+
+    return tuple(
+        db.session.query(WorkClass.name, WorkClass.color)
+        .order_by(WorkClass.is_default.desc(), WorkClass.name.asc())
+        .all()
+    )
+
+
+def _get_work_classes() -> List[Tuple[str, str | None]]:
+    """Liefert ``(Name, Farbe)`` aller Arbeitsklassen in Anzeigereihenfolge."""
+
+    return list(_load_work_classes(str(db.engine.url), _data_version))
+
+
+# Zwischenspeicher für gerenderte Monatsberichte; ein neuer Datenstand
+# verwirft alle bis dahin gespeicherten Seiten.
+_REPORT_PAGE_CACHE_LIMIT = 256
+_report_page_cache: Dict[Tuple[object, ...], Tuple[int, float, str]] = {}
+
+
+def _get_cached_report_page(key: Tuple[object, ...]) -> str | None:
+    """Liefert eine gespeicherte Berichtsseite, sofern Datenstand und Laufzeit passen."""
+
+    entry = _report_page_cache.get(key)
+    if entry is None:
+        return None
+    version, expires_at, html = entry
+    if version != _data_version or expires_at < time_module.monotonic():
+        _report_page_cache.pop(key, None)
+        return None
+    return html
+
+
+def _store_report_page(key: Tuple[object, ...], version: int, html: str, timeout: int) -> None:
+    """Speichert eine gerenderte Berichtsseite für ``timeout`` Sekunden.
+
+    ``version`` ist der Datenstand vor dem Rendern; ein Commit während des
+    Renderns macht die Seite damit sofort ungültig.
+    """
+
+    if len(_report_page_cache) >= _REPORT_PAGE_CACHE_LIMIT:
+        _report_page_cache.clear()
+    _report_page_cache[key] = (version, time_module.monotonic() + timeout, html)
+
+
+def _clear_report_page_cache() -> None:
+    """Verwirft alle gespeicherten Berichtsseiten."""
+
+    _report_page_cache.clear()
+
+
 def _get_available_group_names(include_unassigned: bool = True) -> List[str]:
     """Bestimmt alle bekannten Positions- bzw. Arbeitsklassen-Gruppen."""
 
-    work_classes = (
-        WorkClass.query.order_by(WorkClass.is_default.desc(), WorkClass.name.asc()).all()
-    )
     names: List[str] = []
     seen: set[str] = set()
 
-    for work_class in work_classes:
-        if work_class.name and work_class.name not in seen:
-            names.append(work_class.name)
-            seen.add(work_class.name)
-
-    existing_positions = [
-        value
-        for (value,) in (
-            db.session.query(Employee.position)
-            .filter(Employee.position.isnot(None))
-            .filter(Employee.position != "")
-            .distinct()
-            .order_by(Employee.position)
-            .all()
-        )
-    ]
+    for name, _ in _get_work_classes():
+        if name and name not in seen:
+            names.append(name)
+            seen.add(name)
+
+    existing_positions = _get_employee_positions()
 
     for value in existing_positions:
         if value and value not in seen:
@@ -354,7 +626,22 @@ def _get_available_group_names(include_unassigned: bool = True) -> List[str]:
     return names
 
 def calculate_productivity_for_dates(dates: List[date], department_id: int | None = None) -> Dict[date, Dict[str, float]]:
-    """Berechnet Produktivitätskennzahlen für eine beliebige Liste an Tagen."""
+    """Berechnet Produktivitätskennzahlen für eine beliebige Liste an Tagen.
+
+    Das Ergebnis wird je Datenstand zwischengespeichert und darf von Aufrufern
+    nicht verändert werden.
+    """
+
+    return _load_productivity_for_dates(
+        str(db.engine.url), _data_version, tuple(dates), department_id or None
+    )
+
+
+@lru_cache(maxsize=64)
+def _load_productivity_for_dates(
+    database_url: str, version: int, dates: Tuple[date, ...], department_id: int | None
+) -> Dict[date, Dict[str, float]]:
+    """Berechnet die Produktivitätskennzahlen; Ergebnis gilt je Datenbank, Datenstand und Tagen."""
 
     if not dates:
         return {}
@@ -363,7 +650,8 @@ def calculate_productivity_for_dates(dates: List[date], department_id: int | Non
     start_date = relevant_days[0]
     end_date = relevant_days[-1]
 
-    shifts_query = Shift.query.filter(
+    # Mitarbeiterdaten (Abteilung, Position, Stunden) werden je Einsatz gelesen.
+    shifts_query = Shift.query.options(selectinload(Shift.employee)).filter(
         Shift.date >= start_date,
         Shift.date <= end_date,
         Shift.approved == True
@@ -372,7 +660,7 @@ def calculate_productivity_for_dates(dates: List[date], department_id: int | Non
     if department_id:
         shifts_query = shifts_query.join(Employee).filter(Employee.department_id == department_id)
 
-    shifts = shifts_query.all()
+    shifts = shifts_query.order_by(Shift.id).all()
 
     leaves_query = Leave.query.filter(
         Leave.start_date <= end_date,
@@ -386,15 +674,7 @@ def calculate_productivity_for_dates(dates: List[date], department_id: int | Non
     ).all()
     blocked_dates = {blocked.date for blocked in blocked_days}
 
-    productivity_settings = {}
-    all_settings = ProductivitySettings.query.filter_by(is_active=True).all()
-
-    for setting in all_settings:
-        if setting.department_id:
-            productivity_settings[setting.department_id] = setting.productivity_value
-        else:
-            productivity_settings['global'] = setting.productivity_value
-
+    productivity_settings = _get_productivity_settings()
     default_productivity = productivity_settings.get('global', 40.0)
 
     shifts_by_day: Dict[date, List[Shift]] = {day: [] for day in relevant_days}
@@ -523,13 +803,27 @@ def calculate_employee_hours_summary(employee_id: int, year: int = None, month:
     Returns:
         Dict mit Stunden-Zusammenfassung
     """
-    from datetime import date, datetime
-    import calendar
-    
     if year is None or month is None:
         today = date.today()
         year = year or today.year
         month = month or today.month
+
+    # Innerhalb einer Anfrage wird das Ergebnis je (Mitarbeiter, Jahr, Monat) wiederverwendet.
+    request_cache = g.get("employee_hours_cache") if has_app_context() else None
+    cache_key = (employee_id, year, month)
+    if request_cache is not None and cache_key in request_cache:
+        return request_cache[cache_key]
+
+    summary = _compute_employee_hours_summary(employee_id, year, month)
+    if request_cache is not None:
+        request_cache[cache_key] = summary
+    return summary
+
+
+def _compute_employee_hours_summary(employee_id: int, year: int, month: int):
+    """Berechnet die Stunden-Zusammenfassung ohne Zwischenspeicher."""
+    from datetime import date, datetime
+    import calendar
     
     # Berechne Zeitraum für den aktuellen Monat
     start_date = date(year, month, 1)
@@ -548,13 +842,17 @@ def calculate_employee_hours_summary(employee_id: int, year: int = None, month:
     ).all()
 
     # Hole alle genehmigten Schichten für den Zeitraum
-    # Berücksichtige nur Schichten bis zum heutigen Tag (inklusive)
-    shifts = Shift.query.filter(
+    # Berücksichtige nur Schichten bis zum heutigen Tag (inklusive).
+    # Nur die benötigten Spalten laden; die Zeilen bieten dieselben Attribute
+    # wie Shift-Objekte, ohne ORM-Instanzen zu erzeugen.
+    shifts = db.session.query(
+        Shift.date, Shift.hours, Shift.shift_type, Shift.approved
+    ).filter(
         Shift.employee_id == employee_id,
         Shift.date >= start_date,
         Shift.date <= min(end_date, today),  # Nur vergangene/heutige Tage
         Shift.approved == True
-    ).all()
+    ).order_by(Shift.date, Shift.id).all()
     
     # Berechne geleistete Stunden (nur vergangene Tage)
     worked_hours = sum(shift.hours for shift in shifts)
@@ -644,6 +942,140 @@ def calculate_employee_hours_summary(employee_id: int, year: int = None, month:
             'leaves_detail': all_leaves
         }
 
+def _sick_days_chart(year: int, month: int, department_id: int | None = None) -> List[List[object]]:
+    """Summiert die Krankheitstage je Mitarbeiter für Krankmeldungen, die im Monat beginnen.
+
+    Liefert ``[[Name, Tage], ...]`` für das Diagramm der Abwesenheitsübersicht;
+    mit ``department_id`` nur für Mitarbeiter dieser Abteilung.
+    """
+
+    month_start = date(year, month, 1)
+    next_month_start = date(year + (month == 12), month % 12 + 1, 1)
+    query = db.session.query(
+        Employee.name,
+        cast(
+            func.sum(func.julianday(Leave.end_date) - func.julianday(Leave.start_date) + 1),
+            Float,
+        ).label('total_days')
+    ).join(Leave).filter(
+        Leave.leave_type == 'Krank',
+        Leave.start_date >= month_start,
+        Leave.start_date < next_month_start
+    )
+    if department_id:
+        query = query.filter(Employee.department_id == department_id)
+    return [[name, total_days] for name, total_days in query.group_by(Employee.id, Employee.name).all()]
+
+
+def calculate_monthly_worked_hours(
+    employee_id: int, start_date: date, end_date: date
+) -> Dict[Tuple[int, int], float]:
+    """Summiert die genehmigten Stunden eines Mitarbeiters je ``(Jahr, Monat)``.
+
+    Alle Einsätze des Zeitraums werden mit einer Abfrage geladen und in der
+    Reihenfolge aufsummiert, die auch ``calculate_employee_hours_summary``
+    verwendet.
+    """
+
+    hours_by_month: Dict[Tuple[int, int], List[float]] = defaultdict(list)
+    rows = (
+        db.session.query(Shift.date, Shift.hours)
+        .filter(
+            Shift.employee_id == employee_id,
+            Shift.date >= start_date,
+            Shift.date <= end_date,
+            Shift.approved == True,
+        )
+        .order_by(Shift.date, Shift.id)
+        .all()
+    )
+    for shift_date, hours in rows:
+        hours_by_month[(shift_date.year, shift_date.month)].append(hours)
+    return {key: sum(values) for key, values in hours_by_month.items()}
+
+
+def get_past_monthly_hours(employee: Employee, year: int, month: int) -> Tuple[Dict[str, object], ...]:
+    """Liefert die Diagrammpunkte der elf Monate vor ``year``/``month`` (älteste zuerst).
+
+    Das Ergebnis wird je Datenstand zwischengespeichert und darf von Aufrufern
+    nicht verändert werden.
+    """
+
+    database_url = str(db.engine.url)
+    target_hours = employee.monthly_hours or 0
+    tracks_overtime = (employee.position or "").lower() == "aushilfe"
+    # Ohne einen einzigen genehmigten Einsatz sind alle Vormonate leer; diese
+    # Reihe hängt nicht vom Datenstand ab und übersteht daher jeden Commit.
+    if not _employee_has_approved_shifts(database_url, _data_version, employee.id):
+        return _empty_past_monthly_hours(year, month, target_hours, tracks_overtime)
+    return _load_past_monthly_hours(
+        database_url, _data_version, employee.id, year, month, target_hours, tracks_overtime
+    )
+
+
+@lru_cache(maxsize=256)
+def _employee_has_approved_shifts(database_url: str, version: int, employee_id: int) -> bool:
+    """Prüft, ob der Mitarbeiter überhaupt einen genehmigten Einsatz hat."""
+
+    return db.session.query(
+        exists().where(Shift.employee_id == employee_id, Shift.approved == True)
+    ).scalar()
+
+
+@lru_cache(maxsize=32)
+def _empty_past_monthly_hours(
+    year: int, month: int, target_hours: float, tracks_overtime: bool
+) -> Tuple[Dict[str, object], ...]:
+    """Vormonatswerte ohne geleistete Stunden."""
+
+    return _build_past_monthly_hours(year, month, {}, target_hours, tracks_overtime)
+
+
+@lru_cache(maxsize=128)
+def _load_past_monthly_hours(
+    database_url: str,
+    version: int,
+    employee_id: int,
+    year: int,
+    month: int,
+    target_hours: float,
+    tracks_overtime: bool,
+) -> Tuple[Dict[str, object], ...]:
+    """Berechnet die Vormonatswerte; Ergebnis gilt je Datenbank, Datenstand und Monat."""
+
+    # Die elf Vormonate sind abgeschlossen; ihre Stunden werden gemeinsam geladen.
+    first_year, first_month, _ = _trailing_12_months(year, month)[0]
+    worked_by_month = calculate_monthly_worked_hours(
+        employee_id,
+        date(first_year, first_month, 1),
+        date(year, month, 1) - timedelta(days=1),
+    )
+    return _build_past_monthly_hours(year, month, worked_by_month, target_hours, tracks_overtime)
+
+
+def _build_past_monthly_hours(
+    year: int,
+    month: int,
+    worked_by_month: Dict[Tuple[int, int], float],
+    target_hours: float,
+    tracks_overtime: bool,
+) -> Tuple[Dict[str, object], ...]:
+    """Erzeugt die Diagrammpunkte der elf Vormonate aus den geleisteten Stunden."""
+
+    monthly_data = []
+    for past_year, past_month, label in _trailing_12_months(year, month)[:-1]:
+        worked_hours = worked_by_month.get((past_year, past_month), 0)
+        monthly_data.append({
+            'month_year': f"{past_month}/{past_year}",
+            'label': label,
+            'worked_hours': worked_hours,
+            'target_hours': target_hours,
+            'proportional_target': target_hours,
+            'remaining_hours': max(0, target_hours - worked_hours),
+            'overtime_hours': max(0, worked_hours - target_hours) if tracks_overtime else 0,
+        })
+    return tuple(monthly_data)
+
 def get_all_employees_hours_summary(year: int = None, month: int = None, department_id: int = None):
     """Berechnet die Stunden-Zusammenfassung für alle Mitarbeiter.
     
@@ -655,8 +1087,14 @@ def get_all_employees_hours_summary(year: int = None, month: int = None, departm
     Returns:
         Dict mit employee_id als Schlüssel und Stunden-Zusammenfassung als Wert
     """
+    # Innerhalb einer Anfrage wird das Ergebnis je (Jahr, Monat, Abteilung) wiederverwendet.
+    request_cache = g.get("hours_summary_cache") if has_app_context() else None
+    cache_key = (year, month, department_id)
+    if request_cache is not None and cache_key in request_cache:
+        return request_cache[cache_key]
+
     if department_id:
-        employees = Employee.query.filter_by(department_id=department_id).all()
+        employees = Employee.query.filter_by(department_id=department_id).order_by(Employee.id).all()
     else:
         employees = Employee.query.all()
     
@@ -665,6 +1103,8 @@ def get_all_employees_hours_summary(year: int = None, month: int = None, departm
     for employee in employees:
         summary[employee.id] = calculate_employee_hours_summary(employee.id, year, month)
     
+    if request_cache is not None:
+        request_cache[cache_key] = summary
     return summary
 
 def get_planning_insights(year: int = None, month: int = None, department_id: int = None):
@@ -684,6 +1124,11 @@ def get_planning_insights(year: int = None, month: int = None, department_id: in
         today = date.today()
         year = year or today.year
         month = month or today.month
+
+    request_cache = g.get("planning_insights_cache") if has_app_context() else None
+    cache_key = (year, month, department_id)
+    if request_cache is not None and cache_key in request_cache:
+        return request_cache[cache_key]
     
     hours_summary = get_all_employees_hours_summary(year, month, department_id)
     
@@ -707,7 +1152,9 @@ def get_planning_insights(year: int = None, month: int = None, department_id: in
         # Nur Aushilfen in den Kapazitätsberechnungen berücksichtigen
         if employee.position != 'Aushilfe':
             continue
-            
+
+        # Kopie, da die Stundenübersicht innerhalb der Anfrage geteilt wird.
+        data = dict(data)
         data['employee_name'] = employee.name
         data['department'] = employee.department.name if employee.department else 'Keine Abteilung'
         
@@ -745,7 +1192,7 @@ def get_planning_insights(year: int = None, month: int = None, department_id: in
     coverage_rate = (total_worked_hours / total_target_hours * 100) if total_target_hours else 0
     net_available_hours = total_remaining_hours - total_overtime_hours
 
-    return {
+    insights = {
         'underutilized': underutilized,
         'overutilized': overutilized,
         'balanced': balanced,
@@ -766,6 +1213,9 @@ def get_planning_insights(year: int = None, month: int = None, department_id: in
         'month': month,
         'year': year
     }
+    if request_cache is not None:
+        request_cache[cache_key] = insights
+    return insights
 
 # ---------------------------------------------------------------------------
 # Authentifizierungs‑Decorator
@@ -835,7 +1285,11 @@ def get_user_department_employees():
     if not current_user or not current_user.department_id:
         return Employee.query.all()  # Fallback: alle Mitarbeiter wenn keine Abteilung
     
-    return Employee.query.filter_by(department_id=current_user.department_id).all()
+    return (
+        Employee.query.filter_by(department_id=current_user.department_id)
+        .order_by(Employee.id)
+        .all()
+    )
 
 def department_required(view):
     """Decorator, der sicherstellt, dass der Benutzer einer Abteilung zugeordnet ist."""
@@ -911,10 +1365,33 @@ def _create_notification(recipient_id: int, message: str, link: str | None = Non
 def _build_shift_request_message(employee: Employee, shift_date: date) -> str:
     """Erstellt eine konsistente Meldung für neue Einsatzanträge."""
 
-    display_date = shift_date.strftime("%d.%m.%Y")
+    display_date = _format_date(shift_date)
     return f"{employee.name} hat einen Einsatz am {display_date} eingereicht."
 
 
+def _shift_request_json(shift: Shift, approved: bool) -> Dict[str, object]:
+    """Wandelt einen Einsatz für den Kalkulator der Einsatzübersicht in JSON-Daten um."""
+
+    employee = shift.employee
+    department = employee.department
+    return {
+        'id': shift.id,
+        'hours': shift.hours,
+        'shift_type': shift.shift_type,
+        'approved': approved,
+        'employee': {
+            'id': employee.id,
+            'name': employee.name,
+            'position': employee.position,
+            'department_id': employee.department_id,
+            'department': {
+                'id': department.id,
+                'name': department.name
+            } if department else None
+        }
+    }
+
+
 def _build_leave_request_message(
     employee: Employee,
     leave_type: str,
@@ -924,10 +1401,10 @@ def _build_leave_request_message(
     """Erstellt eine konsistente Meldung für neue Abwesenheitsanträge."""
 
     if start_date == end_date:
-        date_range = start_date.strftime("%d.%m.%Y")
+        date_range = _format_date(start_date)
     else:
         date_range = (
-            f"{start_date.strftime('%d.%m.%Y')} bis {end_date.strftime('%d.%m.%Y')}"
+            f"{_format_date(start_date)} bis {_format_date(end_date)}"
         )
     return f"{employee.name} hat {leave_type} für {date_range} beantragt."
 
@@ -946,6 +1423,18 @@ def _clear_request_notifications(message: str, link: str | None = None) -> None:
     query.delete(synchronize_session=False)
 
 
+def _clear_request_notifications_batch(requests: List[Tuple[str, str]]) -> None:
+    """Entfernt Benachrichtigungen zu mehreren erledigten Vorgängen in einem DELETE."""
+
+    keys = list(dict.fromkeys((message, link) for message, link in requests if message))
+    if not keys:
+        return
+
+    Notification.query.filter(
+        tuple_(Notification.message, Notification.link).in_(keys)
+    ).delete(synchronize_session=False)
+
+
 def notify_admins_of_request(employee: Employee, message: str, link: str | None = None) -> None:
     """Informiert alle relevanten Administratoren über einen neuen Antrag."""
 
@@ -995,6 +1484,21 @@ def _parse_days_of_week(days: str | None) -> list[int]:
     return sorted(parsed)
 
 
+# ceil(2**32 / 7) – Multiplikator für die Restberechnung in ``_mod7``.
+_FASTMOD7_MULTIPLIER = 613_566_757
+
+
+def _mod7(value: int) -> int:
+    """Berechnet ``value % 7`` für kleine, nicht negative Werte per Multiplikation.
+
+    Für Werte außerhalb des geprüften Bereichs wird auf ``%`` zurückgegriffen.
+    """
+
+    if 0 <= value < 1 << 26:
+        return (((value * _FASTMOD7_MULTIPLIER) & 0xFFFFFFFF) * 7) >> 32
+    return value % 7
+
+
 def _calculate_next_run(
     schedule_type: str,
     run_time_value,
@@ -1014,9 +1518,19 @@ def _calculate_next_run(
         return None
 
     run_time = run_time_value
+    # Ausführungszeitpunkt am Referenztag, direkt statt über datetime.combine gebildet.
+    same_day_run = datetime(
+        reference.year,
+        reference.month,
+        reference.day,
+        run_time.hour,
+        run_time.minute,
+        run_time.second,
+        run_time.microsecond,
+    )
 
     if schedule_type == "daily":
-        candidate = datetime.combine(reference.date(), run_time)
+        candidate = same_day_run
         if candidate <= reference:
             candidate += timedelta(days=1)
         return candidate
@@ -1027,22 +1541,48 @@ def _calculate_next_run(
             allowed_days = list(range(7))
 
         for delta in range(0, 8):
-            candidate_date = reference.date() + timedelta(days=delta)
-            candidate_dt = datetime.combine(candidate_date, run_time)
+            candidate_dt = same_day_run + timedelta(days=delta)
             if candidate_dt <= reference:
                 continue
-            if candidate_date.weekday() in allowed_days:
+            if candidate_dt.weekday() in allowed_days:
                 return candidate_dt
 
         # Fallback: nächsten passenden Wochentag bestimmen.
         weekday = reference.weekday()
-        offsets = [((day - weekday) % 7) or 7 for day in allowed_days]
-        candidate_date = reference.date() + timedelta(days=min(offsets))
-        return datetime.combine(candidate_date, run_time)
+        offsets = [_mod7(day - weekday + 7) or 7 for day in allowed_days]
+        return same_day_run + timedelta(days=min(offsets))
 
     return None
 
 
+@lru_cache(maxsize=512)
+def _forecast_schedule_runs(
+    schedule_type: str,
+    run_time_value,
+    days: str | None,
+    first_run: datetime,
+    limit: int,
+) -> Tuple[datetime, ...]:
+    """Berechnet die Folgetermine eines Zeitplans ab ``first_run`` (zwischengespeichert)."""
+
+    occurrences: List[datetime] = [first_run]
+    current = first_run
+
+    for _ in range(1, max(1, limit)):
+        next_occurrence = _calculate_next_run(
+            schedule_type,
+            run_time_value,
+            days,
+            reference=current + timedelta(seconds=1),
+        )
+        if not next_occurrence:
+            break
+        occurrences.append(next_occurrence)
+        current = next_occurrence
+
+    return tuple(occurrences[:limit])
+
+
 def _forecast_automation_runs(
     automation: ApprovalAutomation,
     *,
@@ -1050,117 +1590,189 @@ def _forecast_automation_runs(
 ) -> List[datetime]:
     """Ermittelt die nächsten geplanten Ausführungszeitpunkte einer Automation."""
 
-    occurrences: List[datetime] = []
-
     if not automation.next_run:
-        return occurrences
+        return []
 
-    current = automation.next_run
-    occurrences.append(current)
+    # Einmalige Automatisierungen besitzen keine Folgetermine.
+    if automation.schedule_type == "once":
+        return [automation.next_run][:limit]
 
-    for _ in range(1, max(1, limit)):
-        next_occurrence = _calculate_next_run(
+    return list(
+        _forecast_schedule_runs(
             automation.schedule_type,
             automation.run_time,
             automation.days_of_week,
-            reference=current + timedelta(seconds=1),
+            automation.next_run,
+            limit,
         )
-        if not next_occurrence:
-            break
-        occurrences.append(next_occurrence)
-        current = next_occurrence
-
-    return occurrences[:limit]
+    )
 
 
-def _execute_automation(automation: ApprovalAutomation) -> str:
-    """Führt eine Automatisierung aus und gibt eine Zusammenfassung zurück."""
+def _automation_approve_shifts(
+    automation: ApprovalAutomation,
+    summary_parts: List[str],
+    cleared_requests: List[Tuple[str, str]],
+) -> str | None:
+    """Gibt alle offenen Einsätze frei und benachrichtigt die Mitarbeitenden."""
 
+    shift_link = url_for("shift_requests_overview")
+    schedule_links: Dict[Tuple[int, int], str] = {}
     approved_shifts = 0
-    approved_leaves = 0
-    created_schedule_shifts = 0
-    skipped_schedule_shifts = 0
-    schedule_month_label: str | None = None
 
-    shift_link = url_for("shift_requests_overview")
-    leave_link = url_for("leave_requests")
+    pending_shifts = (
+        Shift.query.filter_by(approved=False).options(selectinload(Shift.employee)).all()
+    )
+    for shift in pending_shifts:
+        request_message = _build_shift_request_message(shift.employee, shift.date)
+        cleared_requests.append((request_message, shift_link))
+        month_key = (shift.date.year, shift.date.month)
+        schedule_link = schedule_links.get(month_key)
+        if schedule_link is None:
+            schedule_link = url_for("schedule", month=shift.date.month, year=shift.date.year)
+            schedule_links[month_key] = schedule_link
+        notify_employee(
+            shift.employee_id,
+            f"Dein Einsatz am {_format_date(shift.date)} wurde automatisch genehmigt.",
+            schedule_link,
+        )
+        approved_shifts += 1
 
-    if automation.automation_type in {"approve_shifts", "approve_all"}:
-        pending_shifts = Shift.query.filter_by(approved=False).all()
-        for shift in pending_shifts:
-            shift.approved = True
-            request_message = _build_shift_request_message(shift.employee, shift.date)
-            _clear_request_notifications(request_message, shift_link)
-            notify_employee(
-                shift.employee_id,
-                f"Dein Einsatz am {shift.date.strftime('%d.%m.%Y')} wurde automatisch genehmigt.",
-                url_for("schedule", month=shift.date.month, year=shift.date.year),
-            )
-            approved_shifts += 1
-
-    if automation.automation_type in {"approve_leaves", "approve_all"}:
-        pending_leaves = Leave.query.filter_by(approved=False).all()
-        for leave in pending_leaves:
-            leave.approved = True
-            request_message = _build_leave_request_message(
-                leave.employee,
-                leave.leave_type,
-                leave.start_date,
-                leave.end_date,
-            )
-            _clear_request_notifications(request_message, leave_link)
-            if leave.start_date == leave.end_date:
-                date_range = leave.start_date.strftime('%d.%m.%Y')
-            else:
-                date_range = (
-                    f"{leave.start_date.strftime('%d.%m.%Y')} bis {leave.end_date.strftime('%d.%m.%Y')}"
-                )
-            notify_employee(
-                leave.employee_id,
-                f"Dein {leave.leave_type}-Antrag für {date_range} wurde automatisch genehmigt.",
-                url_for("leave_form"),
-            )
-            approved_leaves += 1
+    # Die Freigabe selbst erfolgt als ein UPDATE; die geladenen Zeilen
+    # werden nur für die Benachrichtigungen benötigt.
+    if pending_shifts:
+        Shift.query.filter(Shift.id.in_([shift.id for shift in pending_shifts])).update(
+            {Shift.approved: True}
+        )
+
+    if approved_shifts:
+        summary_parts.append(f"{approved_shifts} Einsätze freigegeben")
+    return None
 
-    if automation.automation_type == "auto_schedule_position":
-        if not automation.target_position:
-            return "Keine Zielgruppe für die Auto-Schicht-Automatisierung hinterlegt."
 
-        reference_dt = automation.next_run or datetime.now()
-        target_year = reference_dt.year
-        target_month = reference_dt.month
+def _automation_approve_leaves(
+    automation: ApprovalAutomation,
+    summary_parts: List[str],
+    cleared_requests: List[Tuple[str, str]],
+) -> str | None:
+    """Genehmigt alle offenen Abwesenheiten und benachrichtigt die Mitarbeitenden."""
 
-        result = create_default_shifts_for_employee_position(
-            automation.target_position,
-            target_year,
-            target_month,
+    leave_link = url_for("leave_requests")
+    leave_form_link = url_for("leave_form")
+    approved_leaves = 0
+
+    pending_leaves = (
+        Leave.query.filter_by(approved=False).options(selectinload(Leave.employee)).all()
+    )
+    for leave in pending_leaves:
+        request_message = _build_leave_request_message(
+            leave.employee,
+            leave.leave_type,
+            leave.start_date,
+            leave.end_date,
+        )
+        cleared_requests.append((request_message, leave_link))
+        if leave.start_date == leave.end_date:
+            date_range = _format_date(leave.start_date)
+        else:
+            date_range = (
+                f"{_format_date(leave.start_date)} bis {_format_date(leave.end_date)}"
+            )
+        notify_employee(
+            leave.employee_id,
+            f"Dein {leave.leave_type}-Antrag für {date_range} wurde automatisch genehmigt.",
+            leave_form_link,
         )
+        approved_leaves += 1
 
-        created_schedule_shifts = result.get("total_created", 0)
-        skipped_schedule_shifts = result.get("total_skipped", 0)
-        schedule_month_label = datetime(target_year, target_month, 1).strftime("%m.%Y")
+    if pending_leaves:
+        Leave.query.filter(Leave.id.in_([leave.id for leave in pending_leaves])).update(
+            {Leave.approved: True}
+        )
 
-    summary_parts = []
-    if approved_shifts:
-        summary_parts.append(f"{approved_shifts} Einsätze freigegeben")
     if approved_leaves:
         summary_parts.append(f"{approved_leaves} Abwesenheiten genehmigt")
+    return None
+
+
+def _automation_approve_all(
+    automation: ApprovalAutomation,
+    summary_parts: List[str],
+    cleared_requests: List[Tuple[str, str]],
+) -> str | None:
+    """Gibt offene Einsätze und Abwesenheiten gemeinsam frei."""
 
-    if schedule_month_label is not None:
-        schedule_part = f"{created_schedule_shifts} Schichten erstellt"
-        if skipped_schedule_shifts:
-            schedule_part += f", {skipped_schedule_shifts} übersprungen"
-        if not created_schedule_shifts and not skipped_schedule_shifts:
-            schedule_part = "Keine Schichten erstellt"
-        schedule_part += f" ({automation.target_position}, Monat {schedule_month_label})"
-        summary_parts.append(schedule_part)
+    _automation_approve_shifts(automation, summary_parts, cleared_requests)
+    return _automation_approve_leaves(automation, summary_parts, cleared_requests)
+
+
+def _automation_auto_schedule(
+    automation: ApprovalAutomation,
+    summary_parts: List[str],
+    cleared_requests: List[Tuple[str, str]],
+) -> str | None:
+    """Plant Standardschichten für die hinterlegte Mitarbeitergruppe ein."""
+
+    if not automation.target_position:
+        return "Keine Zielgruppe für die Auto-Schicht-Automatisierung hinterlegt."
+
+    reference_dt = automation.next_run or datetime.now()
+    target_year = reference_dt.year
+    target_month = reference_dt.month
+
+    result = create_default_shifts_for_employee_position(
+        automation.target_position,
+        target_year,
+        target_month,
+    )
+
+    created_schedule_shifts = result.get("total_created", 0)
+    skipped_schedule_shifts = result.get("total_skipped", 0)
+    schedule_month_label = datetime(target_year, target_month, 1).strftime("%m.%Y")
+
+    schedule_part = f"{created_schedule_shifts} Schichten erstellt"
+    if skipped_schedule_shifts:
+        schedule_part += f", {skipped_schedule_shifts} übersprungen"
+    if not created_schedule_shifts and not skipped_schedule_shifts:
+        schedule_part = "Keine Schichten erstellt"
+    schedule_part += f" ({automation.target_position}, Monat {schedule_month_label})"
+    summary_parts.append(schedule_part)
+    return None
+
+
+# Jeder Automatisierungstyp führt nur die für ihn relevanten Abfragen aus.
+# Liefert ein Handler einen Text zurück, ersetzt dieser die Zusammenfassung.
+_AUTOMATION_HANDLERS = {
+    "approve_shifts": _automation_approve_shifts,
+    "approve_leaves": _automation_approve_leaves,
+    "approve_all": _automation_approve_all,
+    "auto_schedule_position": _automation_auto_schedule,
+}
+
+
+def _execute_automation(automation: ApprovalAutomation) -> str:
+    """Führt eine Automatisierung aus und gibt eine Zusammenfassung zurück."""
+
+    # Wie die Handler ihre Links löst auch diese Funktion ihren Link vor jeder
+    # Änderung auf: Ohne Request-Kontext scheitert url_for so, bevor etwa die
+    # Auto-Schicht-Planung Schichten committet.
+    settings_link = url_for("system_settings")
+    summary_parts: List[str] = []
+    cleared_requests: List[Tuple[str, str]] = []
+
+    handler = _AUTOMATION_HANDLERS.get(automation.automation_type)
+    if handler is not None:
+        early_summary = handler(automation, summary_parts, cleared_requests)
+        if early_summary is not None:
+            return early_summary
+
+    _clear_request_notifications_batch(cleared_requests)
 
     if summary_parts:
         summary_text = " · ".join(summary_parts)
         admin_message = f"Automation '{automation.name}' hat {summary_text}."
         admins = Employee.query.filter(Employee.is_admin.is_(True)).all()
         for admin in admins:
-            _create_notification(admin.id, admin_message, url_for("system_settings"))
+            _create_notification(admin.id, admin_message, settings_link)
     else:
         summary_text = "Keine offenen Vorgänge gefunden."
 
@@ -1249,10 +1861,239 @@ WEEKDAY_LABELS = [
     ("6", "Sonntag"),
 ]
 
+# Aus den Auswahllisten abgeleitete Nachschlagetabellen für Prüfung und Anzeige
+_VALID_AUTOMATION_TYPES = frozenset(value for value, _ in AUTOMATION_TYPE_CHOICES)
+_VALID_SCHEDULES = frozenset(value for value, _ in SCHEDULE_CHOICES)
+_AUTOMATION_TYPE_LABELS = dict(AUTOMATION_TYPE_CHOICES)
+_SCHEDULE_LABELS = dict(SCHEDULE_CHOICES)
+_WEEKDAY_LABEL_MAP = dict(WEEKDAY_LABELS)
+
+# Tagesstatus der persönlichen Wochenübersicht ohne geplanten Einsatz,
+# nach "abwesend" (True) bzw. "frei" (False).
+_PERSONAL_DAY_STATUS = {
+    True: {"status": "leave", "description": "Als abwesend markiert."},
+    False: {"status": "free", "description": "Keine Einsätze geplant."},
+}
+
+# Empfehlungstexte der persönlichen Stundenübersicht
+_REC_BELOW_TARGET = (
+    "Du liegst {:.1f} Stunden unter dem Monatsziel. Plane zusätzliche Einsätze oder prüfe offene Schichten."
+).format
+_REC_TARGET_REACHED = "Du hast dein Monatsziel erreicht – nutze die Zeit für Ausgleich oder Weiterbildung."
+_REC_BEHIND_PRORATED = (
+    "Bis heute fehlen {:.1f} Stunden zu den anteiligen Soll-Stunden. Kleine zusätzliche Einsätze gleichen das aus."
+).format
+_REC_AHEAD_OF_PRORATED = (
+    "Du liegst {:.1f} Stunden vor dem anteiligen Soll – behalte deine Erholung im Blick."
+).format
+_REC_OVERTIME = (
+    "Aktuell stehen {:.1f} Überstunden an. Prüfe Möglichkeiten zum Ausgleich oder zur Freigabe."
+).format
+_REC_NO_SHIFTS = "Es wurden noch keine genehmigten Schichten erfasst. Bitte reiche deine Zeiten zeitnah ein."
+
+# Ab dieser Anzahl Einsätze werden Stundenaufschlüsselungen mit NumPy/pandas
+# gebildet; darunter ist die einfache Schleife schneller.
+_VECTORIZE_MIN_SHIFTS = 32
+
+def _shift_columns(shifts) -> Dict[str, np.ndarray]:
+    """Überführt Schicht-Zeilen ``(Datum, Stunden, Schichtart, ...)`` in Spalten-Arrays.
+
+    Liefert ``weekday``, ``hours``, ``type_code`` und ``date_ord`` als gleich
+    lange NumPy-Arrays (Struktur aus Arrays statt Liste von Zeilen) sowie unter
+    ``type_name`` die Schichtarten je Kennung. Schichtarten erhalten dabei
+    fortlaufende Kennungen in Reihenfolge ihres ersten Auftretens.
+    """
+
+    type_ids: Dict[str, int] = {}
+    dates, hours, type_codes = zip(
+        *(
+            (row[0], row[1], type_ids.setdefault(row[2] or "Unbekannt", len(type_ids)))
+            for row in shifts
+        )
+    )
+    date_ord = np.fromiter(map(date.toordinal, dates), dtype=np.int64, count=len(dates))
+    return {
+        'date_ord': date_ord,
+        # Ordinal 1 (01.01.0001) ist ein Montag
+        'weekday': (date_ord - 1) % 7,
+        'hours': np.array(hours, dtype=float),
+        'type_code': np.array(type_codes, dtype=np.intp),
+        'type_name': np.array(list(type_ids), dtype=object),
+    }
+
+
+def _aggregate_shift_hours(columns: Dict[str, np.ndarray]) -> Tuple[Dict[int, float], Dict[str, float]]:
+    """Summiert Stunden je Wochentag und je Schichtart aus ``_shift_columns``.
+
+    Schichtarten behalten die Reihenfolge ihres ersten Auftretens.
+    """
+
+    hours = columns['hours']
+    type_names = columns['type_name']
+    weekday_sums = np.bincount(columns['weekday'], weights=hours, minlength=7)
+    type_sums = np.bincount(columns['type_code'], weights=hours, minlength=len(type_names))
+    return dict(enumerate(weekday_sums.tolist())), dict(zip(type_names.tolist(), type_sums.tolist()))
+
+
+def _build_hours_dashboard(employee: Employee) -> Dict[str, object]:
+    """Bereitet die Kennzahlen der persönlichen Stundenübersicht für den aktuellen Monat auf.
+
+    Liefert die Template-Variablen von ``employee_hours_overview``; die
+    Diagrammdaten daraus stellt auch die JSON-Schnittstelle bereit.
+    """
+
+    current_year = date.today().year
+    current_month = date.today().month
+
+    # Hole die Stundenübersicht für den aktuellen Monat
+    hours_summary = calculate_employee_hours_summary(employee.id, current_year, current_month)
+
+    # Diagrammpunkte der letzten 12 Monate (älteste zuerst); die Vormonate
+    # stammen aus dem Zwischenspeicher, der aktuelle Monat aus der Zusammenfassung.
+    _, _, current_label = _trailing_12_months(current_year, current_month)[-1]
+    monthly_data = list(get_past_monthly_hours(employee, current_year, current_month))
+    monthly_data.append({
+        'month_year': f"{current_month}/{current_year}",
+        'label': current_label,
+        'worked_hours': hours_summary.get('worked_hours', 0),
+        'target_hours': hours_summary.get('target_hours', 0),
+        'proportional_target': hours_summary.get('proportional_target', 0),
+        'remaining_hours': hours_summary.get('remaining_hours', 0),
+        'overtime_hours': hours_summary.get('overtime_hours', 0),
+    })
+
+    # Wochentags- und Schichtarten-Analyse; bei vielen Einsätzen vektorisiert
+    shifts_detail = hours_summary.get('shifts_detail', [])
+    if len(shifts_detail) >= _VECTORIZE_MIN_SHIFTS:
+        weekday_hours, shift_type_hours = _aggregate_shift_hours(_shift_columns(shifts_detail))
+    else:
+        weekday_hours = {i: 0 for i in range(7)}
+        shift_type_hours = defaultdict(int)
+        for shift in shifts_detail:
+            weekday_hours[shift.date.weekday()] += shift.hours
+            shift_type_hours[shift.shift_type or "Unbekannt"] += shift.hours
+
+    # Aufschlüsselung, stärkster und schwächster (aber belegter) Wochentag
+    # entstehen in einem Durchlauf; weekday_hours ist nach Wochentag 0-6 geordnet.
+    total_weekday_hours = sum(weekday_hours.values())
+    weekday_breakdown = []
+    top_weekday = None
+    calm_weekday = None
+    for (_, label), value in zip(WEEKDAY_LABELS, weekday_hours.values()):
+        percentage = (value / total_weekday_hours * 100) if total_weekday_hours else 0
+        item = {
+            'label': label,
+            'hours': value,
+            'percentage': percentage
+        }
+        weekday_breakdown.append(item)
+        if top_weekday is None or value > top_weekday['hours']:
+            top_weekday = item
+        if value > 0 and (calm_weekday is None or value < calm_weekday['hours']):
+            calm_weekday = item
+    if not total_weekday_hours:
+        top_weekday = None
+
+    total_shift_type_hours = sum(shift_type_hours.values())
+    shift_breakdown = [
+        {
+            'type': shift_type,
+            'hours': value,
+            'percentage': (value / total_shift_type_hours * 100) if total_shift_type_hours else 0,
+        }
+        for shift_type, value in sorted(shift_type_hours.items(), key=itemgetter(1), reverse=True)
+    ]
+
+    recent_months = monthly_data[-4:] if monthly_data else []
+    monthly_trend = None
+    if len(monthly_data) >= 2:
+        last_month = monthly_data[-1]
+        previous_month = monthly_data[-2]
+        difference = last_month['worked_hours'] - previous_month['worked_hours']
+        monthly_trend = {
+            'current': last_month,
+            'previous': previous_month,
+            'difference': difference,
+            'direction': 'up' if difference >= 0 else 'down'
+        }
+
+    completion_percentage = hours_summary.get('completion_percentage', 0)
+    progress_percentage = max(0, min(completion_percentage, 100))
+
+    remaining_hours = hours_summary.get('remaining_hours', 0)
+    proportional_target = hours_summary.get('proportional_target', 0)
+    worked_hours = hours_summary.get('worked_hours', 0)
+    overtime_hours = hours_summary.get('overtime_hours', 0)
+    shift_count = hours_summary.get('shift_count', 0)
+
+    # Je Block genau eine Empfehlung, also höchstens drei
+    recommendations = [
+        _REC_BELOW_TARGET(remaining_hours) if remaining_hours > 0 else _REC_TARGET_REACHED
+    ]
+    if proportional_target and worked_hours < proportional_target:
+        recommendations.append(_REC_BEHIND_PRORATED(proportional_target - worked_hours))
+    elif proportional_target:
+        recommendations.append(_REC_AHEAD_OF_PRORATED(worked_hours - proportional_target))
+
+    if overtime_hours > 0:
+        recommendations.append(_REC_OVERTIME(overtime_hours))
+    elif shift_count == 0:
+        recommendations.append(_REC_NO_SHIFTS)
+
+    return {
+        'hours_summary': hours_summary,
+        'monthly_data': monthly_data,
+        'recent_months': recent_months,
+        'monthly_trend': monthly_trend,
+        'weekday_hours': weekday_hours,
+        'weekday_breakdown': weekday_breakdown,
+        'top_weekday': top_weekday,
+        'calm_weekday': calm_weekday,
+        'shift_type_hours': shift_type_hours,
+        'shift_breakdown': shift_breakdown,
+        'recommendations': recommendations,
+        'progress_percentage': progress_percentage,
+        'completion_percentage': completion_percentage,
+        'current_month': current_month,
+        'current_year': current_year,
+    }
+
+
+_EMPLOYEE_TEXT_FIELDS = (
+    "name",
+    "employee_number",
+    "email",
+    "phone",
+    "position",
+    "short_code",
+    "username",
+)
+
+
+def _read_employee_text_fields(form) -> Dict[str, str | None]:
+    """Liest die Textfelder des Mitarbeiterformulars gekürzt ein; leere Angaben werden zu None."""
+
+    return {field: (form.get(field) or "").strip() or None for field in _EMPLOYEE_TEXT_FIELDS}
+
+
 def create_app() -> Flask:
 
     """Erzeugt und konfiguriert die Flask‑Anwendung."""
     app = Flask(__name__)
+    # Kompilierte Templates unbegrenzt zwischenspeichern. Muss vor dem ersten
+    # Zugriff auf app.jinja_env gesetzt werden, da Jinja den Cache beim Anlegen
+    # der Umgebung erzeugt.
+    # Zusätzlich wird der kompilierte Bytecode auf der Platte abgelegt, damit
+    # ein Neustart des Prozesses die Templates nicht erneut parsen muss. Ohne
+    # Pfadangabe legt Jinja ein eigenes Verzeichnis je Benutzer (Modus 0700) an
+    # und prüft dessen Eigentümer.
+    app.jinja_options = {
+        **app.jinja_options,
+        "cache_size": -1,
+        "bytecode_cache": FileSystemBytecodeCache(),
+    }
+    if orjson is not None:
+        app.json = _ORJSONProvider(app)
     app.config["SQLALCHEMY_DATABASE_URI"] = "sqlite:///planner.db"
     app.config["SQLALCHEMY_TRACK_MODIFICATIONS"] = False
     app.config["SECRET_KEY"] = secrets.token_hex(32)
@@ -1353,33 +2194,25 @@ def create_app() -> Flask:
             try:
                 conn = sqlite3.connect(db_file)
                 cursor = conn.cursor()
-                cursor.execute("PRAGMA table_info(employee);")
-                cols = [row[1] for row in cursor.fetchall()]
-                upgrades = {
-                    "short_code": "ALTER TABLE employee ADD COLUMN short_code VARCHAR(20)",
-                    "username": "ALTER TABLE employee ADD COLUMN username VARCHAR(120)",
-                    "password_hash": "ALTER TABLE employee ADD COLUMN password_hash VARCHAR(200)",
-                    "is_admin": "ALTER TABLE employee ADD COLUMN is_admin BOOLEAN DEFAULT 0",
-                    "preferred_schedule_view": (
-                        "ALTER TABLE employee "
-                        "ADD COLUMN preferred_schedule_view VARCHAR(20) NOT NULL DEFAULT 'month'"
-                    ),
-                }
-                for col, stmt in upgrades.items():
-                    if col not in cols:
-                        try:
-                            cursor.execute(stmt)
-                        except Exception:
-                            pass
-                conn.commit()
-                try:
-                    cursor.execute("PRAGMA table_info(shift);")
-                    shift_cols = [row[1] for row in cursor.fetchall()]
-                    if "approved" not in shift_cols:
-                        cursor.execute("ALTER TABLE shift ADD COLUMN approved BOOLEAN DEFAULT 0")
-                        conn.commit()
-                except Exception:
-                    pass
+                _ensure_sqlite_columns(
+                    cursor,
+                    "employee",
+                    {
+                        "short_code": "ALTER TABLE employee ADD COLUMN short_code VARCHAR(20)",
+                        "username": "ALTER TABLE employee ADD COLUMN username VARCHAR(120)",
+                        "password_hash": "ALTER TABLE employee ADD COLUMN password_hash VARCHAR(200)",
+                        "is_admin": "ALTER TABLE employee ADD COLUMN is_admin BOOLEAN DEFAULT 0",
+                        "preferred_schedule_view": (
+                            "ALTER TABLE employee "
+                            "ADD COLUMN preferred_schedule_view VARCHAR(20) NOT NULL DEFAULT 'month'"
+                        ),
+                    },
+                )
+                _ensure_sqlite_columns(
+                    cursor,
+                    "shift",
+                    {"approved": "ALTER TABLE shift ADD COLUMN approved BOOLEAN DEFAULT 0"},
+                )
             except Exception:
                 pass
             finally:
@@ -1415,6 +2248,14 @@ def create_app() -> Flask:
             return True
         return endpoint in {"setup"}
 
+    @app.before_request
+    def reset_request_caches():
+        """Legt die anfragebezogenen Zwischenspeicher für Auswertungen an."""
+
+        g.employee_hours_cache = {}
+        g.hours_summary_cache = {}
+        g.planning_insights_cache = {}
+
     @app.before_request
     def ensure_setup_completed():
         if _is_initial_setup_required() and not _is_setup_request():
@@ -1560,46 +2401,51 @@ def create_app() -> Flask:
             leaves_query = leaves_query.join(Employee).filter(Employee.department_id == department_id)
 
         shifts = (
-            shifts_query.options(joinedload(Shift.employee).joinedload(Employee.department)).all()
+            shifts_query.options(selectinload(Shift.employee).selectinload(Employee.department))
+            .order_by(Shift.id)
+            .all()
         )
         leaves = (
-            leaves_query.options(joinedload(Leave.employee).joinedload(Employee.department)).all()
+            leaves_query.options(selectinload(Leave.employee).selectinload(Employee.department)).all()
         )
 
         approved_shifts = [shift for shift in shifts if shift.approved]
 
-        hours_by_day = {day: 0.0 for day in week_dates}
-        employees_by_day: Dict[date, set[int]] = {day: set() for day in week_dates}
+        # Die Woche umfasst immer genau sieben Tage ab ``week_start``; die
+        # Tageswerte werden daher über den Tagesversatz in Listen abgelegt.
+        hours_by_day: List[float] = [0.0] * 7
+        employees_by_day: List[set[int]] = [set() for _ in range(7)]
         scheduled_employee_hours: Dict[int, float] = defaultdict(float)
         unique_employees_scheduled: set[int] = set()
 
         for shift in approved_shifts:
-            hours_by_day[shift.date] = hours_by_day.get(shift.date, 0.0) + shift.hours
-            employees_by_day.setdefault(shift.date, set()).add(shift.employee_id)
+            day_index = (shift.date - week_start).days
+            hours_by_day[day_index] += shift.hours
+            employees_by_day[day_index].add(shift.employee_id)
             unique_employees_scheduled.add(shift.employee_id)
             scheduled_employee_hours[shift.employee_id] += shift.hours
 
-        employees_on_leave_by_day: Dict[date, set[int]] = {day: set() for day in week_dates}
-        leave_type_counter: Counter[str] = Counter()
-        leave_status_counter: Counter[str] = Counter()
+        leave_type_counter: Counter[str] = Counter(leave.leave_type for leave in leaves)
+        leave_status_counter: Counter[str] = Counter(
+            "approved" if leave.approved else "pending" for leave in leaves
+        )
 
+        employees_on_leave_by_day: List[set[int]] = [set() for _ in range(7)]
         for leave in leaves:
-            leave_type_counter[leave.leave_type] += 1
-            leave_status_counter["approved" if leave.approved else "pending"] += 1
-
-            current = max(leave.start_date, week_start)
-            last = min(leave.end_date, week_end)
-            while current <= last:
-                employees_on_leave_by_day.setdefault(current, set()).add(leave.employee_id)
-                current += timedelta(days=1)
+            first_index = (max(leave.start_date, week_start) - week_start).days
+            last_index = (min(leave.end_date, week_end) - week_start).days
+            for day_index in range(first_index, last_index + 1):
+                employees_on_leave_by_day[day_index].add(leave.employee_id)
 
         team_capacity = []
         total_hours = 0.0
-        for day in week_dates:
-            scheduled_count = len(employees_by_day.get(day, set()))
-            on_leave_count = len(employees_on_leave_by_day.get(day, set()))
+        for day, day_hours, scheduled_ids, on_leave_ids in zip(
+            week_dates, hours_by_day, employees_by_day, employees_on_leave_by_day
+        ):
+            scheduled_count = len(scheduled_ids)
+            on_leave_count = len(on_leave_ids)
             available_count = max(employee_count - on_leave_count, 0)
-            hours = round(hours_by_day.get(day, 0.0), 2)
+            hours = round(day_hours, 2)
             coverage = round((scheduled_count / available_count) * 100, 1) if available_count else 0.0
 
             total_hours += hours
@@ -1607,7 +2453,7 @@ def create_app() -> Flask:
             team_capacity.append(
                 {
                     "date_iso": day.isoformat(),
-                    "date_label": f"{weekday_short_names[day.weekday()]} {day.strftime('%d.%m.')}",
+                    "date_label": f"{weekday_short_names[day.weekday()]} {_format_day_month(day)}",
                     "hours": hours,
                     "scheduled": scheduled_count,
                     "on_leave": on_leave_count,
@@ -1649,7 +2495,7 @@ def create_app() -> Flask:
                 "scheduled": entry["scheduled"],
                 "available": entry["available"],
             }
-            for entry in sorted(team_capacity, key=lambda item: item["coverage"])[:3]
+            for entry in heapq.nsmallest(3, team_capacity, key=lambda item: item["coverage"])
         ]
 
         week_chart = {
@@ -1700,9 +2546,9 @@ def create_app() -> Flask:
 
         top_contributors = [
             {"name": employee_lookup.get(emp_id, "Mitarbeiter"), "hours": round(hours, 2)}
-            for emp_id, hours in sorted(
-                scheduled_employee_hours.items(), key=lambda item: item[1], reverse=True
-            )[:5]
+            for emp_id, hours in heapq.nlargest(
+                5, scheduled_employee_hours.items(), key=lambda item: item[1]
+            )
         ]
 
         personal_week_overview = {"hours": 0.0, "shift_count": 0, "leave_days": 0, "pending_leaves": 0}
@@ -1716,7 +2562,7 @@ def create_app() -> Flask:
             )
             personal_week_overview["shift_count"] = len(personal_week_shifts)
             personal_week_overview["leave_days"] = sum(
-                1 for employees in employees_on_leave_by_day.values() if current_user.id in employees
+                1 for employees in employees_on_leave_by_day if current_user.id in employees
             )
             personal_week_overview["pending_leaves"] = sum(
                 1 for leave in leaves if leave.employee_id == current_user.id and not leave.approved
@@ -1765,8 +2611,8 @@ def create_app() -> Flask:
                         "employee": leave.employee.name if leave.employee else "Unbekannt",
                         "employee_id": leave.employee_id,
                         "approved": bool(leave.approved),
-                        "start": leave.start_date.strftime("%d.%m."),
-                        "end": leave.end_date.strftime("%d.%m."),
+                        "start": _format_day_month(leave.start_date),
+                        "end": _format_day_month(leave.end_date),
                         "department": event_department,
                     },
                 )
@@ -1783,9 +2629,9 @@ def create_app() -> Flask:
             {
                 **data,
                 "date": event_date.isoformat(),
-                "date_label": event_date.strftime("%d.%m.%Y"),
+                "date_label": _format_date(event_date),
             }
-            for event_date, data in sorted(upcoming_events, key=lambda item: item[0])[:6]
+            for event_date, data in heapq.nsmallest(6, upcoming_events, key=lambda item: item[0])
         ]
 
         next_shift_query = Shift.query.filter(Shift.date >= today, Shift.approved == True)
@@ -1794,13 +2640,55 @@ def create_app() -> Flask:
         elif department_id:
             next_shift_query = next_shift_query.join(Employee).filter(Employee.department_id == department_id)
 
-        next_shift = next_shift_query.order_by(Shift.date.asc(), Shift.id.asc()).first()
+        next_pending_leave_query = Leave.query.filter_by(approved=False)
+        if not is_admin and current_user:
+            next_pending_leave_query = next_pending_leave_query.filter(
+                Leave.employee_id == current_user.id
+            )
+        elif department_id:
+            next_pending_leave_query = next_pending_leave_query.join(Employee).filter(
+                Employee.department_id == department_id
+            )
+
+        approval_window_start = today - timedelta(days=30)
+        approval_window_end = today + timedelta(days=30)
+        approval_query = Leave.query.filter(
+            Leave.start_date >= approval_window_start,
+            Leave.start_date <= approval_window_end,
+        )
+        if not is_admin and current_user:
+            approval_query = approval_query.filter(Leave.employee_id == current_user.id)
+        elif department_id:
+            approval_query = approval_query.join(Employee).filter(Employee.department_id == department_id)
+
+        # Nächster Einsatz, nächster offener Antrag und Genehmigungsquote werden
+        # als skalare Unterabfragen in einem einzigen Datenbankaufruf ermittelt.
+        # Der nächste Einsatz nutzt dabei ix_shift_approved_date_id; die Zeile
+        # selbst liegt meist bereits aus der Wochenabfrage in der Session.
+        next_shift_id, next_pending_leave_id, approval_total, approval_approved = db.session.execute(
+            select(
+                next_shift_query.order_by(Shift.date.asc(), Shift.id.asc())
+                .with_entities(Shift.id)
+                .limit(1)
+                .scalar_subquery(),
+                next_pending_leave_query.order_by(Leave.start_date.asc())
+                .with_entities(Leave.id)
+                .limit(1)
+                .scalar_subquery(),
+                approval_query.with_entities(func.count(Leave.id)).scalar_subquery(),
+                approval_query.with_entities(
+                    func.sum(case((Leave.approved == True, 1), else_=0))
+                ).scalar_subquery(),
+            )
+        ).one()
+
+        next_shift = db.session.get(Shift, next_shift_id) if next_shift_id else None
         next_shift_info = None
         if next_shift:
             next_shift_info = {
                 "title": next_shift.shift_type or "Einsatz",
                 "hours": round(next_shift.hours, 2),
-                "date_label": next_shift.date.strftime("%d.%m.%Y"),
+                "date_label": _format_date(next_shift.date),
                 "employee": next_shift.employee.name if next_shift.employee else None,
                 "department": (
                     next_shift.employee.department.name
@@ -1810,64 +2698,41 @@ def create_app() -> Flask:
                 "is_personal": current_user is not None and next_shift.employee_id == current_user.id,
             }
 
-        next_pending_leave_query = Leave.query.filter_by(approved=False)
-        if not is_admin and current_user:
-            next_pending_leave_query = next_pending_leave_query.filter(
-                Leave.employee_id == current_user.id
-            )
-        elif department_id:
-            next_pending_leave_query = next_pending_leave_query.join(Employee).filter(
-                Employee.department_id == department_id
-            )
-        next_pending_leave = next_pending_leave_query.order_by(Leave.start_date.asc()).first()
+        next_pending_leave = (
+            db.session.get(Leave, next_pending_leave_id) if next_pending_leave_id else None
+        )
         next_pending_leave_info = None
         if next_pending_leave:
             next_pending_leave_info = {
                 "employee": next_pending_leave.employee.name if next_pending_leave.employee else None,
                 "date_range": (
-                    f"{next_pending_leave.start_date.strftime('%d.%m.%Y')} – "
-                    f"{next_pending_leave.end_date.strftime('%d.%m.%Y')}"
+                    f"{_format_date(next_pending_leave.start_date)} – "
+                    f"{_format_date(next_pending_leave.end_date)}"
                 ),
                 "type": next_pending_leave.leave_type,
             }
 
-        approval_window_start = today - timedelta(days=30)
-        approval_window_end = today + timedelta(days=30)
-        approval_query = Leave.query.filter(
-            Leave.start_date >= approval_window_start,
-            Leave.start_date <= approval_window_end,
-        )
-        if not is_admin and current_user:
-            approval_query = approval_query.filter(Leave.employee_id == current_user.id)
-        elif department_id:
-            approval_query = approval_query.join(Employee).filter(Employee.department_id == department_id)
-        approval_leaves = approval_query.all()
         approval_rate = None
-        if approval_leaves:
-            approved_count = sum(1 for leave in approval_leaves if leave.approved)
-            approval_rate = round((approved_count / len(approval_leaves)) * 100, 1)
+        if approval_total:
+            approval_rate = round(((approval_approved or 0) / approval_total) * 100, 1)
 
-        week_window_label = f"{week_start.strftime('%d.%m.%Y')} – {week_end.strftime('%d.%m.%Y')}"
+        week_window_label = f"{_format_date(week_start)} – {_format_date(week_end)}"
 
         personal_day_overview = []
         if current_user and not is_admin:
-            for entry in team_capacity:
-                status = "free"
-                description = "Keine Einsätze geplant."
-                if entry["scheduled"] > 0:
-                    status = "shift"
-                    description = f"{entry['hours']} Std eingeplant."
-                elif entry["on_leave"] > 0:
-                    status = "leave"
-                    description = "Als abwesend markiert."
-
-                personal_day_overview.append(
-                    {
-                        "date_label": entry["date_label"],
-                        "status": status,
-                        "description": description,
-                    }
-                )
+            personal_day_overview = [
+                {
+                    "date_label": entry["date_label"],
+                    "status": "shift",
+                    "description": f"{entry['hours']} Std eingeplant.",
+                }
+                if entry["scheduled"] > 0
+                else {
+                    "date_label": entry["date_label"],
+                    **_PERSONAL_DAY_STATUS[entry["on_leave"] > 0],
+                }
+                for entry in team_capacity
+            ]
 
         return render_template(
             "index.html",
@@ -1903,7 +2768,8 @@ def create_app() -> Flask:
             username = request.form.get("username", "").strip()
             password = request.form.get("password", "")
             user = None
-            if username:
+            # Leere Eingaben werden ohne Datenbankabfrage und Hashprüfung abgewiesen.
+            if username and password:
                 user = Employee.query.filter_by(username=username).first()
             if user and user.check_password(password):
                 session.clear()
@@ -1943,35 +2809,24 @@ def create_app() -> Flask:
         )
         active_work_classes = [wc for wc in work_classes if wc.is_active]
 
-        position_options: List[str] = []
-        seen_positions: set[str] = set()
-
-        for work_class in active_work_classes:
-            if work_class.name not in seen_positions:
-                position_options.append(work_class.name)
-                seen_positions.add(work_class.name)
-
-        existing_positions = [
+        # Arbeitsklassen sind eindeutig benannt; vergebene Positionen ohne eigene
+        # Arbeitsklasse werden einmalig bestimmt und unten erneut verwendet.
+        # Abteilungsadministratoren sehen nur die Positionen ihrer Abteilung.
+        current_user = get_current_user()
+        user_dept_id = current_user.department_id if current_user else None
+        work_class_names = [work_class.name for work_class in active_work_classes]
+        work_class_name_set = set(work_class_names)
+        extra_positions = [
             value
-            for (value,) in (
-                db.session.query(Employee.position)
-                .filter(Employee.position.isnot(None))
-                .filter(Employee.position != "")
-                .distinct()
-                .order_by(Employee.position)
-                .all()
-            )
+            for value in _get_employee_positions(user_dept_id)
+            if value not in work_class_name_set
         ]
-        for value in existing_positions:
-            if value and value not in seen_positions:
-                position_options.append(value)
-                seen_positions.add(value)
+        position_options: List[str] = work_class_names + extra_positions
 
-        has_unassigned_employees = (
-            db.session.query(Employee.id)
-            .filter(or_(Employee.position.is_(None), Employee.position == ""))
-            .first()
-            is not None
+        has_unassigned_employees = bool(
+            db.session.query(
+                exists().where(or_(Employee.position.is_(None), Employee.position == ""))
+            ).scalar()
         )
 
         position_filter = raw_position_filter
@@ -1983,15 +2838,16 @@ def create_app() -> Flask:
             position_filter = ""
 
         # Abteilungsbasierte Filterung
-        current_user = get_current_user()
         if current_user and current_user.department_id:
             # Nur Mitarbeiter der eigenen Abteilung anzeigen
-            employee_query = Employee.query.filter_by(department_id=current_user.department_id)
+            employee_query = Employee.query.options(
+                selectinload(Employee.department)
+            ).filter_by(department_id=current_user.department_id)
             departments = Department.query.filter_by(id=current_user.department_id).all()
         else:
             # Super-Admin ohne Abteilung sieht alle
-            employee_query = Employee.query
-            departments = Department.query.order_by(Department.name).all()
+            employee_query = Employee.query.options(selectinload(Employee.department))
+            departments = _get_department_options()
 
         if search_query:
             like_pattern = f"%{search_query}%"
@@ -2013,39 +2869,40 @@ def create_app() -> Flask:
         employees = employee_query.order_by(Employee.name).all()
 
         # Berechne Reststunden für alle Mitarbeiter (abteilungsbasiert)
-        user_dept_id = current_user.department_id if current_user else None
 
         hours_summary = get_all_employees_hours_summary(year, month, user_dept_id)
 
         # Generiere Planungshilfen (abteilungsbasiert)
         planning_insights = get_planning_insights(year, month, user_dept_id)
 
-        position_counter = Counter(emp.position for emp in employees if emp.position)
-        hero_position_summary: List[Dict[str, object]] = []
-        summary_names: set[str] = set()
-        for work_class in active_work_classes:
-            hero_position_summary.append(
-                {
-                    "name": work_class.name,
-                    "count": position_counter.get(work_class.name, 0),
-                    "color": _normalize_hex_color(work_class.color)
-                    or _color_from_name(work_class.name),
-                }
-            )
-            summary_names.add(work_class.name)
+        # Ein Durchlauf zählt Positionen und Mitarbeiter ohne Zuordnung zugleich.
+        position_counts: Dict[str, int] = defaultdict(int)
+        unassigned_count = 0
+        for emp in employees:
+            position = emp.position
+            if position and position.strip():
+                position_counts[position] += 1
+            else:
+                unassigned_count += 1
 
-        for value in existing_positions:
-            if value not in summary_names:
-                hero_position_summary.append(
-                    {
-                        "name": value,
-                        "count": position_counter.get(value, 0),
-                        "color": _color_from_name(value),
-                    }
-                )
-                summary_names.add(value)
+        hero_position_summary: List[Dict[str, object]] = [
+            {
+                "name": work_class.name,
+                "count": position_counts.get(work_class.name, 0),
+                "color": _normalize_hex_color(work_class.color)
+                or _color_from_name(work_class.name),
+            }
+            for work_class in active_work_classes
+        ]
+        hero_position_summary.extend(
+            {
+                "name": value,
+                "count": position_counts.get(value, 0),
+                "color": _color_from_name(value),
+            }
+            for value in extra_positions
+        )
 
-        unassigned_count = sum(1 for emp in employees if not (emp.position and emp.position.strip()))
         if unassigned_count:
             hero_position_summary.append(
                 {
@@ -2057,9 +2914,9 @@ def create_app() -> Flask:
 
         non_zero_entries = [entry for entry in hero_position_summary if entry["count"] > 0]
         if non_zero_entries:
-            top_position_summary = sorted(
-                non_zero_entries, key=lambda item: item["count"], reverse=True
-            )[:3]
+            top_position_summary = heapq.nlargest(
+                3, non_zero_entries, key=lambda item: item["count"]
+            )
         else:
             top_position_summary = hero_position_summary[:3]
 
@@ -2093,6 +2950,17 @@ def create_app() -> Flask:
     def monthly_report() -> str:
         """Zeigt einen monatlichen Bericht über Stunden und Abwesenheiten."""
         today = date.today()
+
+        # Gerenderte Berichte werden je Benutzer, Tag und Filter zwischengespeichert,
+        # sofern keine Flash-Meldungen auf ihre Anzeige warten.
+        cache_key = ("monthly_report", session.get("user_id"), today, request.query_string)
+        data_version = _data_version
+        use_page_cache = "_flashes" not in session
+        if use_page_cache:
+            cached_page = _get_cached_report_page(cache_key)
+            if cached_page is not None:
+                return cached_page
+
         month = request.args.get("month", type=int) or today.month
         year = request.args.get("year", type=int) or today.year
 
@@ -2107,70 +2975,81 @@ def create_app() -> Flask:
         is_super_admin = bool(current_user and current_user.is_admin and not current_user.department_id)
 
         selected_department_id = None
-        available_departments: List[Department] = []
+        available_departments: List[Dict[str, object]] = []
 
         if current_user and current_user.department_id:
             selected_department_id = current_user.department_id
         else:
             selected_department_id = request.args.get("department_id", type=int)
-            available_departments = Department.query.order_by(Department.name).all()
-            if selected_department_id and not any(d.id == selected_department_id for d in available_departments):
+            available_departments = _get_department_options()
+            if selected_department_id and not any(d["id"] == selected_department_id for d in available_departments):
                 selected_department_id = None
 
-        employee_query = Employee.query
+        # Abteilungen werden gesammelt nachgeladen, statt je Berichtszeile einzeln.
+        # Für die Berichtszeilen genügen wenige Spalten von Mitarbeiter und Abteilung.
+        employee_query = Employee.query.options(
+            load_only(Employee.id, Employee.name, Employee.position, Employee.department_id),
+            selectinload(Employee.department).load_only(Department.id, Department.name),
+        )
         if selected_department_id:
             employee_query = employee_query.filter_by(department_id=selected_department_id)
 
-        base_employee_count = employee_query.count()
+        base_employee_query = employee_query
 
         search_term = request.args.get("search", "").strip()
-        if search_term:
-            employee_query = employee_query.filter(Employee.name.ilike(f"%{search_term}%"))
-
-        available_positions = [
-            value
-            for (value,) in (
-                db.session.query(Employee.position)
-                .filter(Employee.position.isnot(None))
-                .filter(Employee.position != "")
-                .distinct()
-                .order_by(Employee.position)
-                .all()
-            )
-        ]
-        has_unassigned_positions = bool(
-            employee_query.filter(
-                or_(Employee.position.is_(None), Employee.position == "")
-            ).count()
-        )
-
-        position_filter_options: List[Dict[str, str]] = [
-            {"value": value, "label": value} for value in available_positions
-        ]
-        if has_unassigned_positions:
-            position_filter_options.append({"value": "__NONE__", "label": "Ohne Gruppe"})
+        if search_term:
+            employee_query = employee_query.filter(Employee.name.ilike(f"%{search_term}%"))
+
+        available_positions = _get_employee_positions(
+            current_user.department_id if current_user else None
+        )
 
         has_position_filter = request.args.get("positions_filter") == "1"
         requested_positions = request.args.getlist("position")
         selected_named_positions = [
             position for position in requested_positions if position in available_positions
         ]
-        include_unassigned_selected = "__NONE__" in requested_positions and has_unassigned_positions
+        unassigned_requested = "__NONE__" in requested_positions
 
+        # Filter zuerst vollständig aufbauen und die Mitarbeiter nur einmal laden.
+        # Ein Filter auf "ohne Gruppe" trifft ohnehin nur, wenn es solche Mitarbeiter gibt.
+        filtered_query = employee_query
+        position_filters = []
         if has_position_filter:
-            position_filters = []
             if selected_named_positions:
                 position_filters.append(Employee.position.in_(selected_named_positions))
-            if include_unassigned_selected:
+            if unassigned_requested:
                 position_filters.append(or_(Employee.position.is_(None), Employee.position == ""))
-
             if position_filters:
-                employee_query = employee_query.filter(or_(*position_filters))
-                employees = employee_query.order_by(Employee.name).all()
-            else:
-                employees = []
+                filtered_query = filtered_query.filter(or_(*position_filters))
+
+        employees: List[Employee] = []
+        if position_filters or not has_position_filter:
+            employees = filtered_query.order_by(Employee.name).all()
+
+        if has_position_filter:
+            has_unassigned_positions = bool(
+                db.session.query(
+                    employee_query.filter(
+                        or_(Employee.position.is_(None), Employee.position == "")
+                    ).exists()
+                ).scalar()
+            )
+            base_employee_count = base_employee_query.count()
         else:
-            employees = employee_query.order_by(Employee.name).all()
+            # Ohne Positionsfilter enthält die geladene Liste bereits alle Treffer.
+            has_unassigned_positions = any(not employee.position for employee in employees)
+            base_employee_count = (
+                base_employee_query.count() if search_term else len(employees)
+            )
+
+        position_filter_options: List[Dict[str, str]] = [
+            {"value": value, "label": value} for value in available_positions
+        ]
+        if has_unassigned_positions:
+            position_filter_options.append({"value": "__NONE__", "label": "Ohne Gruppe"})
+
+        include_unassigned_selected = unassigned_requested and has_unassigned_positions
 
         applied_position_filters: List[str] = []
         if has_position_filter:
@@ -2189,41 +3068,36 @@ def create_app() -> Flask:
         summary_department = selected_department_id if selected_department_id else None
         hours_summary = get_all_employees_hours_summary(year, month, summary_department)
 
-        leaves_query = Leave.query.join(Employee).filter(
-            Leave.approved == True,
-            Leave.start_date <= end_date,
-            Leave.end_date >= start_date,
+        # Krank- und ÜSA-Tage werden direkt in SQL je Mitarbeiter und Art summiert.
+        # Die Überlappung mit dem Berichtsmonat ergibt sich über julianday().
+        overlap_days = (
+            func.julianday(func.min(Leave.end_date, end_date))
+            - func.julianday(func.max(Leave.start_date, start_date))
+            + 1
+        )
+        leave_days_query = (
+            db.session.query(Leave.employee_id, Leave.leave_type, func.sum(overlap_days))
+            .join(Employee)
+            .filter(
+                Leave.approved == True,
+                Leave.leave_type.in_(("Krank", "ÜSA")),
+                Leave.start_date <= end_date,
+                Leave.end_date >= start_date,
+            )
         )
         if selected_department_id:
-            leaves_query = leaves_query.filter(Employee.department_id == selected_department_id)
-
-        leaves = leaves_query.all()
+            leave_days_query = leave_days_query.filter(Employee.department_id == selected_department_id)
 
         sick_days_by_employee: Dict[int, int] = {}
         usa_days_by_employee: Dict[int, int] = {}
 
-        for leave in leaves:
-            overlap_start = max(leave.start_date, start_date)
-            overlap_end = min(leave.end_date, end_date)
-            if overlap_start > overlap_end:
-                continue
-            leave_days = (overlap_end - overlap_start).days + 1
-
-            if leave.leave_type == "Krank":
-                sick_days_by_employee[leave.employee_id] = sick_days_by_employee.get(leave.employee_id, 0) + leave_days
-            elif leave.leave_type == "ÜSA":
-                usa_days_by_employee[leave.employee_id] = usa_days_by_employee.get(leave.employee_id, 0) + leave_days
-
-        report_rows = []
-        totals = {
-            "total_hours": 0.0,
-            "total_overtime": 0.0,
-            "total_sick_days": 0,
-            "total_usa_days": 0,
-            "total_target_hours": 0.0,
-            "total_proportional_target": 0.0,
-            "total_remaining_hours": 0.0,
-        }
+        for employee_id, leave_type, leave_days in leave_days_query.group_by(
+            Leave.employee_id, Leave.leave_type
+        ):
+            if leave_type == "Krank":
+                sick_days_by_employee[employee_id] = int(leave_days or 0)
+            else:
+                usa_days_by_employee[employee_id] = int(leave_days or 0)
 
         restrict_overtime_to_aushilfe = bool(
             current_user
@@ -2231,54 +3105,103 @@ def create_app() -> Flask:
             and not is_super_admin
         )
 
-        for employee in employees:
-            summary = hours_summary.get(employee.id, {})
-            worked_hours = float(summary.get("worked_hours", 0))
-            overtime_hours = float(summary.get("overtime_hours", 0))
-            if restrict_overtime_to_aushilfe and employee.position != "Aushilfe":
-                overtime_hours = 0.0
-            target_hours = float(summary.get("target_hours", 0) or 0)
-            proportional_target = float(summary.get("proportional_target", target_hours))
-            remaining_hours = float(summary.get("remaining_hours", 0))
-            sick_days = sick_days_by_employee.get(employee.id, 0)
-            usa_days = usa_days_by_employee.get(employee.id, 0)
-
-            totals["total_hours"] += worked_hours
-            totals["total_overtime"] += overtime_hours
-            totals["total_sick_days"] += sick_days
-            totals["total_usa_days"] += usa_days
-            totals["total_target_hours"] += target_hours
-            totals["total_proportional_target"] += proportional_target
-            totals["total_remaining_hours"] += remaining_hours
-
-            progress_to_date = 0.0
-            if proportional_target:
-                progress_to_date = (worked_hours / proportional_target) * 100
-
-            monthly_completion = 0.0
-            if target_hours:
-                monthly_completion = (worked_hours / target_hours) * 100
-            progress_to_date_clamped = min(progress_to_date, 100.0)
-
-            report_rows.append(
-                {
-                    "employee": employee,
-                    "department_name": employee.department.name if employee.department else "Keine Abteilung",
-                    "worked_hours": worked_hours,
-                    "overtime_hours": overtime_hours,
-                    "target_hours": target_hours,
-                    "proportional_target": proportional_target,
-                    "remaining_hours": remaining_hours,
-                    "sick_days": sick_days,
-                    "usa_days": usa_days,
-                    "is_current_month": bool(summary.get("is_current_month")),
-                    "progress_to_date": progress_to_date,
-                    "progress_to_date_clamped": progress_to_date_clamped,
-                    "monthly_completion": monthly_completion,
-                }
+        # Kennzahlen spaltenweise als Arrays aufbauen, damit Summen und Quoten
+        # vektorisiert statt Zeile für Zeile berechnet werden. Die Stundenübersicht
+        # wird dafür einmalig in der Reihenfolge der Berichtszeilen ausgerichtet.
+        employee_count = len(employees)
+        summary_frame = pd.DataFrame.from_dict(hours_summary, orient="index").reindex(
+            index=[employee.id for employee in employees],
+            columns=[
+                "worked_hours",
+                "overtime_hours",
+                "target_hours",
+                "proportional_target",
+                "remaining_hours",
+                "is_current_month",
+            ],
+        )
+        worked = summary_frame["worked_hours"].fillna(0).to_numpy(dtype=np.float64)
+        target = summary_frame["target_hours"].fillna(0).to_numpy(dtype=np.float64)
+        proportional = (
+            summary_frame["proportional_target"].to_numpy(dtype=np.float64, na_value=np.nan)
+        )
+        proportional = np.where(np.isnan(proportional), target, proportional)
+        remaining = summary_frame["remaining_hours"].fillna(0).to_numpy(dtype=np.float64)
+        overtime = summary_frame["overtime_hours"].fillna(0).to_numpy(dtype=np.float64)
+        if restrict_overtime_to_aushilfe:
+            is_aushilfe = np.fromiter(
+                (employee.position == "Aushilfe" for employee in employees),
+                dtype=bool,
+                count=employee_count,
+            )
+            overtime = np.where(is_aushilfe, overtime, 0.0)
+        is_current_month = summary_frame["is_current_month"].eq(True).tolist()
+        sick_days_list = [sick_days_by_employee.get(employee.id, 0) for employee in employees]
+        usa_days_list = [usa_days_by_employee.get(employee.id, 0) for employee in employees]
+
+        progress = np.zeros(employee_count)
+        np.divide(worked, proportional, out=progress, where=proportional != 0)
+        progress *= 100
+        completion = np.zeros(employee_count)
+        np.divide(worked, target, out=completion, where=target != 0)
+        completion *= 100
+        progress_clamped = np.minimum(progress, 100.0)
+
+        totals = {
+            "total_hours": float(worked.sum()),
+            "total_overtime": float(overtime.sum()),
+            "total_sick_days": sum(sick_days_list),
+            "total_usa_days": sum(usa_days_list),
+            "total_target_hours": float(target.sum()),
+            "total_proportional_target": float(proportional.sum()),
+            "total_remaining_hours": float(remaining.sum()),
+        }
+
+        report_rows = [
+            {
+                "employee": employee,
+                "department_name": employee.department.name if employee.department else "Keine Abteilung",
+                "worked_hours": worked_hours,
+                "overtime_hours": overtime_hours,
+                "target_hours": target_hours,
+                "proportional_target": proportional_target,
+                "remaining_hours": remaining_hours,
+                "sick_days": sick_days,
+                "usa_days": usa_days,
+                "is_current_month": current_month_flag,
+                "progress_to_date": progress_to_date,
+                "progress_to_date_clamped": progress_to_date_clamped,
+                "monthly_completion": monthly_completion,
+            }
+            for (
+                employee,
+                current_month_flag,
+                worked_hours,
+                overtime_hours,
+                target_hours,
+                proportional_target,
+                remaining_hours,
+                sick_days,
+                usa_days,
+                progress_to_date,
+                progress_to_date_clamped,
+                monthly_completion,
+            ) in zip(
+                employees,
+                is_current_month,
+                worked.tolist(),
+                overtime.tolist(),
+                target.tolist(),
+                proportional.tolist(),
+                remaining.tolist(),
+                sick_days_list,
+                usa_days_list,
+                progress.tolist(),
+                progress_clamped.tolist(),
+                completion.tolist(),
             )
+        ]
 
-        employee_count = len(report_rows)
         totals["average_hours"] = totals["total_hours"] / employee_count if employee_count else 0
         totals["average_overtime"] = totals["total_overtime"] / employee_count if employee_count else 0
         totals["average_sick_days"] = totals["total_sick_days"] / employee_count if employee_count else 0
@@ -2332,31 +3255,24 @@ def create_app() -> Flask:
                 for name, data in sorted(department_totals.items(), key=lambda item: item[0].lower())
             ]
 
-        overtime_hotspots = sorted(
-            [row for row in report_rows if row["overtime_hours"] > 0],
-            key=lambda entry: entry["overtime_hours"],
-            reverse=True,
-        )[:3]
-
-        remaining_focus = sorted(
-            [row for row in report_rows if row["remaining_hours"] > 0],
-            key=lambda entry: entry["remaining_hours"],
-            reverse=True,
-        )[:3]
-
-        absence_hotspots = sorted(
-            [
-                row
-                for row in report_rows
-                if (row["sick_days"] or row["usa_days"])
-            ],
-            key=lambda entry: entry["sick_days"] + entry["usa_days"],
-            reverse=True,
-        )[:3]
+        # Die gefilterten Zeilen liefern sowohl die Anzahl als auch die Top-3-Auswahl.
+        overtime_rows = [row for row in report_rows if row["overtime_hours"] > 0]
+        remaining_rows = [row for row in report_rows if row["remaining_hours"] > 0]
+        absence_rows = [row for row in report_rows if (row["sick_days"] or row["usa_days"])]
+
+        overtime_hotspots = heapq.nlargest(
+            3, overtime_rows, key=lambda entry: entry["overtime_hours"]
+        )
+        remaining_focus = heapq.nlargest(
+            3, remaining_rows, key=lambda entry: entry["remaining_hours"]
+        )
+        absence_hotspots = heapq.nlargest(
+            3, absence_rows, key=lambda entry: entry["sick_days"] + entry["usa_days"]
+        )
 
-        overtime_employee_count = sum(1 for row in report_rows if row["overtime_hours"] > 0)
-        remaining_employee_count = sum(1 for row in report_rows if row["remaining_hours"] > 0)
-        absence_employee_count = sum(1 for row in report_rows if (row["sick_days"] or row["usa_days"]))
+        overtime_employee_count = len(overtime_rows)
+        remaining_employee_count = len(remaining_rows)
+        absence_employee_count = len(absence_rows)
 
         month_label = f"{calendar.month_name[month]} {year}"
         prev_month_date = start_date - timedelta(days=1)
@@ -2383,7 +3299,7 @@ def create_app() -> Flask:
         month_choices = [(i, calendar.month_name[i]) for i in range(1, 13)]
         year_choices = list(range(today.year - 2, today.year + 3))
 
-        return render_template(
+        page = render_template(
             "monthly_report.html",
             month=month,
             year=year,
@@ -2412,39 +3328,44 @@ def create_app() -> Flask:
             prev_params=prev_params,
             next_params=next_params,
         )
+        if use_page_cache:
+            # Vergangene Monate ändern sich kaum und dürfen länger vorgehalten werden.
+            _store_report_page(cache_key, data_version, page, 600 if end_date < today else 60)
+        return page
 
     @app.route("/mitarbeiter/hinzufuegen", methods=["POST"])
     @admin_required
     def add_employee() -> str:
         """Legt einen neuen Mitarbeiter an."""
-        name = request.form.get("name", "").strip()
+        form = request.form
+        values = _read_employee_text_fields(form)
+        name = values["name"]
         if not name:
             flash("Bitte geben Sie einen Namen an.", "warning")
             return redirect(url_for("employees"))
-        emp_number = request.form.get("employee_number", "").strip() or None
-        dept_id = request.form.get("department_id") or None
-        dept_id = int(dept_id) if dept_id else None
-        
+
+        try:
+            dept_id = int(form["department_id"]) if form.get("department_id") else None
+            monthly_hours = _parse_hours_value(form.get("monthly_hours"))
+            default_daily_hours = _parse_hours_value(form.get("default_daily_hours"))
+        except ValueError:
+            flash("Abteilung oder Stundenangaben konnten nicht interpretiert werden.", "danger")
+            return redirect(url_for("employees"))
+
         # Abteilungsbasierte Einschränkung
         current_user = get_current_user()
         if current_user and current_user.department_id:
             # Abteilungsadmin kann nur Mitarbeiter in seiner eigenen Abteilung anlegen
             dept_id = current_user.department_id
-        monthly_hours = request.form.get("monthly_hours") or None
-        monthly_hours = float(monthly_hours) if monthly_hours else None
-        email = request.form.get("email", "").strip() or None
-        phone = request.form.get("phone", "").strip() or None
-        position = request.form.get("position", "").strip() or None
-        short_code = request.form.get("short_code", "").strip() or None
-        username = request.form.get("username", "").strip() or None
-        password = request.form.get("password", "")
-        is_admin_flag = bool(request.form.get("is_admin"))
+        password = form.get("password", "")
+        is_admin_flag = bool(form.get("is_admin"))
 
         work_classes = (
             WorkClass.query.order_by(WorkClass.is_default.desc(), WorkClass.name.asc()).all()
         )
         active_work_classes = [wc for wc in work_classes if wc.is_active]
         valid_positions = {wc.name for wc in active_work_classes}
+        position = values["position"]
 
         if active_work_classes and not position:
             flash("Bitte wähle eine Arbeitsklasse für den Mitarbeiter aus.", "warning")
@@ -2455,24 +3376,15 @@ def create_app() -> Flask:
             return redirect(url_for("employees"))
 
         # Standard-Arbeitszeiten verarbeiten
-        default_daily_hours = request.form.get("default_daily_hours") or None
-        default_daily_hours = float(default_daily_hours) if default_daily_hours else None
-        work_days = request.form.getlist("work_days")
-        default_work_days = ",".join(work_days) if work_days else None
-        
+        work_days = form.getlist("work_days")
+
         employee = Employee(
-            name=name,
-            employee_number=emp_number,
+            **values,
             department_id=dept_id,
             monthly_hours=monthly_hours,
-            email=email,
-            phone=phone,
-            position=position,
-            short_code=short_code,
-            username=username,
             is_admin=is_admin_flag,
             default_daily_hours=default_daily_hours,
-            default_work_days=default_work_days,
+            default_work_days=",".join(work_days) if work_days else None,
         )
         if password:
             employee.set_password(password)
@@ -2500,7 +3412,12 @@ def create_app() -> Flask:
     @login_required
     def employee_profile(emp_id: int) -> str:
         """Zeigt die Detailansicht eines Mitarbeiters an."""
-        emp = Employee.query.get_or_404(emp_id)
+        # Die Abteilung wird im Profil angezeigt und direkt mitgeladen.
+        emp = (
+            Employee.query.options(joinedload(Employee.department))
+            .filter_by(id=emp_id)
+            .first_or_404()
+        )
         if not session.get("is_admin") and session.get("user_id") != emp_id:
             flash("Sie können nur Ihr eigenes Profil anzeigen.", "danger")
             return redirect(url_for("index"))
@@ -2540,43 +3457,40 @@ def create_app() -> Flask:
         active_work_classes = [wc for wc in all_work_classes if wc.is_active]
         valid_positions = {wc.name for wc in active_work_classes}
         if request.method == "POST":
-            name = request.form.get("name", "").strip()
-            emp_number = request.form.get("employee_number", "").strip() or None
-            dept_id = request.form.get("department_id") or None
-            dept_id = int(dept_id) if dept_id else None
-            monthly_hours = request.form.get("monthly_hours") or None
-            monthly_hours = float(monthly_hours) if monthly_hours else None
-            email = request.form.get("email", "").strip() or None
-            phone = request.form.get("phone", "").strip() or None
-            position = request.form.get("position", "").strip() or None
-            short_code = request.form.get("short_code", "").strip() or None
-            username = request.form.get("username", "").strip() or None
-            password = request.form.get("password", "")
-            is_admin_flag = bool(request.form.get("is_admin"))
+            form = request.form
+            values = _read_employee_text_fields(form)
+            try:
+                dept_id = int(form["department_id"]) if form.get("department_id") else None
+                monthly_hours = _parse_hours_value(form.get("monthly_hours"))
+                default_daily_hours = _parse_hours_value(form.get("default_daily_hours"))
+            except ValueError:
+                flash("Abteilung oder Stundenangaben konnten nicht interpretiert werden.", "danger")
+                return redirect(url_for("edit_employee", emp_id=emp.id))
+            password = form.get("password", "")
+            is_admin_flag = bool(form.get("is_admin"))
+            position = values["position"]
             if position and position not in valid_positions and position != emp.position:
                 flash("Bitte wähle eine gültige Arbeitsklasse.", "danger")
                 return redirect(url_for("edit_employee", emp_id=emp.id))
-            emp.name = name or emp.name
-            emp.employee_number = emp_number
+            emp.name = values["name"] or emp.name
+            emp.employee_number = values["employee_number"]
             emp.department_id = dept_id
             emp.monthly_hours = monthly_hours
-            emp.email = email
-            emp.phone = phone
+            emp.email = values["email"]
+            emp.phone = values["phone"]
             emp.position = position
-            emp.short_code = short_code
+            emp.short_code = values["short_code"]
             
             # Standard-Arbeitszeiten verarbeiten
-            default_daily_hours = request.form.get("default_daily_hours") or None
-            default_daily_hours = float(default_daily_hours) if default_daily_hours else None
             emp.default_daily_hours = default_daily_hours
             
-            work_days = request.form.getlist("work_days")
+            work_days = form.getlist("work_days")
             emp.default_work_days = ",".join(work_days) if work_days else None
             
             if session.get("is_admin"):
                 emp.is_admin = is_admin_flag
-            if username:
-                emp.username = username
+            if values["username"]:
+                emp.username = values["username"]
             if password:
                 emp.set_password(password)
             db.session.commit()
@@ -2603,14 +3517,24 @@ def create_app() -> Flask:
         is_department_admin = bool(current_user and current_user.department_id)
         is_super_admin = bool(current_user and current_user.is_admin and not current_user.department_id)
 
+        # Abteilungen samt Mitarbeiterzahl in einer Abfrage laden; die
+        # Teammitglieder für die Karten werden gesammelt nachgeladen.
+        department_query = (
+            db.session.query(Department, func.count(Employee.id))
+            .outerjoin(Employee, Employee.department_id == Department.id)
+            .options(selectinload(Department.employees))
+            .group_by(Department.id)
+        )
         if is_department_admin:
             # Abteilungsadmin sieht nur seine eigene Abteilung
-            departments = Department.query.filter_by(id=current_user.department_id).all()
+            department_rows = department_query.filter(Department.id == current_user.department_id).all()
         else:
             # Super-Admin ohne Abteilung sieht alle
-            departments = Department.query.order_by(Department.name).all()
+            department_rows = department_query.order_by(Department.name).all()
 
-        total_employees = sum(len(dept.employees) for dept in departments)
+        departments = [dept for dept, _ in department_rows]
+        employee_counts = {dept.id: count for dept, count in department_rows}
+        total_employees = sum(employee_counts.values())
         areas = sorted(
             {
                 dept.area.strip()
@@ -2637,13 +3561,14 @@ def create_app() -> Flask:
                 "accent": _lighten_hex(base_color, 0.6),
                 "text": _get_contrast_text_color(base_color),
             }
-            if top_department is None or len(dept.employees) > len(top_department.employees):
+            if top_department is None or employee_counts[dept.id] > employee_counts[top_department.id]:
                 top_department = dept
 
         return render_template(
             "departments.html",
             departments=departments,
             department_visuals=department_visuals,
+            employee_counts=employee_counts,
             metrics=metrics,
             areas=areas,
             top_department=top_department,
@@ -2741,7 +3666,7 @@ def create_app() -> Flask:
         parsed_week_start: date | None = None
         if week_start_param:
             try:
-                parsed_week_start = datetime.strptime(week_start_param, "%Y-%m-%d").date()
+                parsed_week_start = date.fromisoformat(week_start_param)
             except ValueError:
                 parsed_week_start = None
 
@@ -2760,8 +3685,7 @@ def create_app() -> Flask:
             # Super-Admin ohne Abteilung kann Abteilung wählen
             department_id = request.args.get("department", type=int)
         
-        cal = calendar.Calendar(firstweekday=0)
-        month_days = [d for d in cal.itermonthdates(year, month) if d.month == month]
+        month_days = list(_month_days(year, month))
         schedule_start = min(month_days[0], week_start)
         schedule_end = max(month_days[-1], week_end)
 
@@ -2806,48 +3730,52 @@ def create_app() -> Flask:
                 .all()
             )
 
-        all_work_classes = (
-            WorkClass.query.order_by(WorkClass.is_default.desc(), WorkClass.name.asc()).all()
-        )
-        work_class_by_name = {wc.name: wc for wc in all_work_classes}
+        all_work_classes = _get_work_classes()
+        work_class_colors = dict(all_work_classes)
 
-        employee_groups: Dict[str, List[Employee]] = {
-            wc.name: [] for wc in all_work_classes
-        }
+        # Mitarbeiter über einen Gruppenindex in Listen einsortieren und das
+        # Dictionary für das Template erst zum Schluss zusammensetzen.
+        group_names = [name for name, _ in all_work_classes]
+        group_index = {name: index for index, name in enumerate(group_names)}
+        group_members: List[List[Employee]] = [[] for _ in group_names]
 
         employees = all_employees
         for emp in employees:
-            position_name = (emp.position or "").strip()
-            if position_name:
-                if position_name not in employee_groups:
-                    employee_groups[position_name] = []
-                employee_groups[position_name].append(emp)
+            position_name = (emp.position or "").strip() or UNASSIGNED_WORK_CLASS_LABEL
+            index = group_index.get(position_name)
+            if index is None:
+                index = group_index[position_name] = len(group_names)
+                group_names.append(position_name)
+                group_members.append([])
+            group_members[index].append(emp)
+
+        employee_groups: Dict[str, List[Employee]] = dict(zip(group_names, group_members))
+        employee_groups.setdefault(UNASSIGNED_WORK_CLASS_LABEL, [])
+
+        saved_order = dict(
+            db.session.query(EmployeeGroupOrder.group_name, EmployeeGroupOrder.order_position).all()
+        )
+        base_order_mapping = {name: index for index, (name, _) in enumerate(all_work_classes)}
+
+        # Sortierschlüssel einmal je Gruppe bilden: gespeicherte Reihenfolge
+        # zuerst, danach Arbeitsklassen und zuletzt die Gruppe ohne Zuordnung.
+        base_count = len(base_order_mapping)
+        group_sort_keys = []
+        for position, name in enumerate(employee_groups):
+            saved_rank = saved_order.get(name)
+            if saved_rank is not None:
+                group_sort_keys.append((0, saved_rank, name.lower(), position, name))
             else:
-                employee_groups.setdefault(UNASSIGNED_WORK_CLASS_LABEL, []).append(emp)
-
-        employee_groups.setdefault(UNASSIGNED_WORK_CLASS_LABEL, employee_groups.get(UNASSIGNED_WORK_CLASS_LABEL, []))
-
-        from models import EmployeeGroupOrder
-
-        group_order_entries = EmployeeGroupOrder.query.order_by(EmployeeGroupOrder.order_position).all()
-        saved_order = {entry.group_name: entry.order_position for entry in group_order_entries}
-        base_order_mapping = {wc.name: index for index, wc in enumerate(all_work_classes)}
-
-        def _group_sort_key(name: str) -> Tuple[int, int, str]:
-            if name in saved_order:
-                return (0, saved_order[name], name.lower())
-            base_rank = base_order_mapping.get(name, len(base_order_mapping))
-            if name == UNASSIGNED_WORK_CLASS_LABEL:
-                base_rank += len(base_order_mapping)
-            return (1, base_rank, name.lower())
-
-        ordered_group_names = sorted(employee_groups.keys(), key=_group_sort_key)
+                base_rank = base_order_mapping.get(name, base_count)
+                if name == UNASSIGNED_WORK_CLASS_LABEL:
+                    base_rank += base_count
+                group_sort_keys.append((1, base_rank, name.lower(), position, name))
+        group_sort_keys.sort()
+        ordered_group_names = [key[-1] for key in group_sort_keys]
 
         group_meta: Dict[str, Dict[str, str]] = {}
         for group_name in employee_groups.keys():
-            work_class = work_class_by_name.get(group_name)
-            base_color = work_class.color if work_class else None
-            group_meta[group_name] = _build_group_meta(group_name, base_color)
+            group_meta[group_name] = _build_group_meta(group_name, work_class_colors.get(group_name))
 
         # Für Rückwärtskompatibilität
         vollzeit_employees = list(employee_groups.get("Vollzeit", []))
@@ -2856,55 +3784,53 @@ def create_app() -> Flask:
 
         shifts_query = Shift.query.filter(
             Shift.date.between(schedule_start, schedule_end)
-        ).all()
+        ).order_by(Shift.id).all()
         shifts = {(s.employee_id, s.date): s for s in shifts_query}
+        # Nur Abwesenheiten der angezeigten Mitarbeiter laden und je Antrag den
+        # betroffenen Ausschnitt der angezeigten Tage übernehmen.
         leaves_query = Leave.query.filter(
             and_(
                 Leave.start_date <= schedule_end,
                 Leave.end_date >= schedule_start,
-                Leave.approved == True
+                Leave.approved == True,
+                Leave.employee_id.in_([emp.id for emp in employees]),
             )
-        ).all()
+        ).order_by(Leave.id).all()
+        schedule_days = [
+            schedule_start + timedelta(days=offset)
+            for offset in range((schedule_end - schedule_start).days + 1)
+        ]
         leaves: Dict[Tuple[int, date], Leave] = {}
         for leave in leaves_query:
-            current_date = max(leave.start_date, schedule_start)
-            last_relevant_day = min(leave.end_date, schedule_end)
-            while current_date <= last_relevant_day:
-                leaves[(leave.employee_id, current_date)] = leave
-                current_date += timedelta(days=1)
+            first_index = max((leave.start_date - schedule_start).days, 0)
+            last_index = (min(leave.end_date, schedule_end) - schedule_start).days
+            leaves.update(
+                ((leave.employee_id, day), leave)
+                for day in schedule_days[first_index:last_index + 1]
+            )
         blocked_days_query = BlockedDay.query.filter(
             BlockedDay.date.between(schedule_start, schedule_end)
         ).all()
+        # Das Dictionary wird nur im Template für die Sperrgründe benötigt; für
+        # die reinen Zugehörigkeitsprüfungen genügt ein unveränderliches Set.
         blocked_days = {bd.date: bd for bd in blocked_days_query}
-        blocked_dates = set(blocked_days.keys())
-
-        employee_totals = {
-            emp.id: sum(
-                s.hours
-                for (eid, day), s in shifts.items()
-                if (
-                    eid == emp.id
-                    and s.approved
-                    and day.month == month
-                    and day.year == year
-                    and day not in blocked_dates
-                )
-            )
-            for emp in employees
-        }
-        week_employee_totals = {
-            emp.id: sum(
-                s.hours
-                for (eid, day), s in shifts.items()
-                if (
-                    eid == emp.id
-                    and s.approved
-                    and week_start <= day <= week_end
-                    and day not in blocked_dates
-                )
-            )
-            for emp in employees
-        }
+        blocked_dates = frozenset(bd.date for bd in blocked_days_query)
+
+        # Monats- und Wochensummen in einem Durchlauf über die bereits geladenen
+        # Einsätze bilden (je Mitarbeiter und Tag zählt wie im Raster ein Einsatz).
+        employee_totals = {emp.id: 0 for emp in employees}
+        week_employee_totals = {emp.id: 0 for emp in employees}
+        for (employee_id, day), shift in shifts.items():
+            if (
+                employee_id not in employee_totals
+                or not shift.approved
+                or day in blocked_dates
+            ):
+                continue
+            if day.month == month and day.year == year:
+                employee_totals[employee_id] += shift.hours
+            if week_start <= day <= week_end:
+                week_employee_totals[employee_id] += shift.hours
         total_week_hours = sum(week_employee_totals.values())
         employees_with_shifts = sum(1 for hours in week_employee_totals.values() if hours > 0)
         departments = Department.query.order_by(Department.name).all()
@@ -2918,14 +3844,14 @@ def create_app() -> Flask:
 
         # Gesperrte Tage stehen bereits als Dictionary zur Verfügung
 
-        week_assignments: Dict[str, List[Dict[str, object]]] = {}
-        for day in week_days:
-            if day in blocked_dates:
-                week_assignments[day.isoformat()] = []
-                continue
-
-            assignments: List[Dict[str, object]] = []
-            for emp in employees:
+        # Mitarbeiter einmal nach Namen sortieren und die Wochentage in einem
+        # Durchlauf befüllen, statt jede Tagesliste einzeln zu sortieren.
+        week_assignments: Dict[str, List[Dict[str, object]]] = {
+            day.isoformat(): [] for day in week_days
+        }
+        open_week_days = [day for day in week_days if day not in blocked_dates]
+        for emp in sorted(employees, key=lambda employee: employee.name.lower()):
+            for day in open_week_days:
                 shift = shifts.get((emp.id, day))
                 if not shift:
                     continue
@@ -2934,7 +3860,7 @@ def create_app() -> Flask:
                 if leave and leave.leave_type in LEAVE_TYPES_EXCLUDED_FROM_PRODUCTIVITY:
                     continue
 
-                assignments.append(
+                week_assignments[day.isoformat()].append(
                     {
                         "employeeId": emp.id,
                         "employeeName": emp.name,
@@ -2945,9 +3871,6 @@ def create_app() -> Flask:
                     }
                 )
 
-            assignments.sort(key=lambda entry: entry["employeeName"].lower())
-            week_assignments[day.isoformat()] = assignments
-
         return render_template(
             "schedule.html",
             month=month,
@@ -3028,7 +3951,7 @@ def create_app() -> Flask:
             return redirect(url_for("schedule"))
 
         employee = Employee.query.get_or_404(emp_id)
-        shift_date = datetime.strptime(date_str, "%Y-%m-%d").date()
+        shift_date = date.fromisoformat(date_str)
 
         # Prüfen, ob das Datum ein gesperrter Tag ist
         if BlockedDay.query.filter_by(date=shift_date).first():
@@ -3090,10 +4013,25 @@ def create_app() -> Flask:
     @admin_required
     def shift_requests_overview() -> str:
         """Liste der offenen Einsatzanträge."""
-        pending_shifts = Shift.query.filter_by(approved=False).order_by(Shift.date).all()
+        pending_shifts = (
+            Shift.query.options(joinedload(Shift.employee).joinedload(Employee.department))
+            .filter_by(approved=False)
+            .order_by(Shift.date)
+            .all()
+        )
         
-        # Hole auch genehmigte Schichten für den Kalkulator
-        approved_shifts = Shift.query.filter_by(approved=True).order_by(Shift.date).all()
+        # Hole auch genehmigte Schichten für den Kalkulator. Dieser bietet nur
+        # Tage mit offenen Anträgen zur Auswahl an, daher genügen deren Einsätze.
+        pending_dates = {shift.date for shift in pending_shifts}
+        approved_shifts = (
+            Shift.query.options(joinedload(Shift.employee).joinedload(Employee.department))
+            .filter_by(approved=True)
+            .filter(Shift.date.in_(pending_dates))
+            .order_by(Shift.date)
+            .all()
+            if pending_dates
+            else []
+        )
         
         # Gruppiere Schichten nach Datum für den Kalkulator
         from collections import defaultdict
@@ -3110,70 +4048,22 @@ def create_app() -> Flask:
         sorted_dates = sorted(shifts_by_date_raw.keys())
         
         # Hole Produktivitätseinstellungen
-        productivity_settings = {}
-        all_settings = ProductivitySettings.query.filter_by(is_active=True).all()
-        for setting in all_settings:
-            if setting.department_id:
-                # Konvertiere zu String für JSON
-                productivity_settings[str(setting.department_id)] = setting.productivity_value
-            else:
-                productivity_settings['global'] = setting.productivity_value
+        # Konvertiere Abteilungs-IDs zu Strings für JSON
+        productivity_settings = {
+            str(key): value for key, value in _get_productivity_settings().items()
+        }
         
         default_productivity = productivity_settings.get('global', 40.0)
         
         # Konvertiere für JSON: date objects zu strings, shift objects zu dicts
-        shifts_by_date_json = {}
-        approved_by_date_json = {}
-        
-        # Alle Daten sammeln (pending + approved)
-        all_dates = set(list(shifts_by_date_raw.keys()) + list(approved_by_date_raw.keys()))
-        
-        for date_obj in all_dates:
-            date_str = date_obj.strftime('%Y-%m-%d')
-            
-            # Ausstehende Schichten
-            if date_obj in shifts_by_date_raw:
-                shifts_by_date_json[date_str] = [
-                    {
-                        'id': s.id,
-                        'hours': s.hours,
-                        'shift_type': s.shift_type,
-                        'approved': False,
-                        'employee': {
-                            'id': s.employee.id,
-                            'name': s.employee.name,
-                            'position': s.employee.position,
-                            'department_id': s.employee.department_id,
-                            'department': {
-                                'id': s.employee.department.id,
-                                'name': s.employee.department.name
-                            } if s.employee.department else None
-                        }
-                    }
-                    for s in shifts_by_date_raw[date_obj]
-                ]
-            
-            # Genehmigte Schichten
-            if date_obj in approved_by_date_raw:
-                approved_by_date_json[date_str] = [
-                    {
-                        'id': s.id,
-                        'hours': s.hours,
-                        'shift_type': s.shift_type,
-                        'approved': True,
-                        'employee': {
-                            'id': s.employee.id,
-                            'name': s.employee.name,
-                            'position': s.employee.position,
-                            'department_id': s.employee.department_id,
-                            'department': {
-                                'id': s.employee.department.id,
-                                'name': s.employee.department.name
-                            } if s.employee.department else None
-                        }
-                    }
-                    for s in approved_by_date_raw[date_obj]
-                ]
+        shifts_by_date_json = {
+            date_obj.strftime('%Y-%m-%d'): [_shift_request_json(s, False) for s in day_shifts]
+            for date_obj, day_shifts in shifts_by_date_raw.items()
+        }
+        approved_by_date_json = {
+            date_obj.strftime('%Y-%m-%d'): [_shift_request_json(s, True) for s in day_shifts]
+            for date_obj, day_shifts in approved_by_date_raw.items()
+        }
         
         return render_template(
             "shift_requests.html",
@@ -3233,167 +4123,45 @@ def create_app() -> Flask:
         # Hole das Employee-Objekt
         employee = Employee.query.get_or_404(employee_id)
 
-        current_year = date.today().year
-        current_month = date.today().month
-
-        # Hole die Stundenübersicht für den aktuellen Monat
-        hours_summary = calculate_employee_hours_summary(employee_id, current_year, current_month)
-        
-        # Hole die Stundenübersicht für die letzten 12 Monate für Diagramme
-        month_names = [
-            "Januar", "Februar", "März", "April", "Mai", "Juni",
-            "Juli", "August", "September", "Oktober", "November", "Dezember"
-        ]
-
-        monthly_data = []
-        for i in range(12):
-            month = current_month - i
-            year = current_year
-            if month <= 0:
-                month += 12
-                year -= 1
-            summary = calculate_employee_hours_summary(employee_id, year, month)
-            monthly_data.append({
-                'month_year': f"{month}/{year}",
-                'label': f"{month_names[month - 1]} {year}",
-                'worked_hours': summary.get('worked_hours', 0),
-                'target_hours': summary.get('target_hours', 0),
-                'proportional_target': summary.get('proportional_target', 0),
-                'remaining_hours': summary.get('remaining_hours', 0),
-                'overtime_hours': summary.get('overtime_hours', 0),
-            })
-        monthly_data.reverse() # Älteste zuerst
-
-        # Wochentags-Analyse
-        weekday_hours = {i: 0 for i in range(7)}
-        for shift in hours_summary.get('shifts_detail', []):
-            weekday_hours[shift.date.weekday()] += shift.hours
-
-        # Schichtarten-Analyse
-        shift_type_hours = {}
-        for shift in hours_summary.get('shifts_detail', []):
-            shift_type = shift.shift_type or "Unbekannt"
-            shift_type_hours[shift_type] = shift_type_hours.get(shift_type, 0) + shift.hours
-
-        total_weekday_hours = sum(weekday_hours.values())
-        weekday_labels = [
-            "Montag", "Dienstag", "Mittwoch", "Donnerstag",
-            "Freitag", "Samstag", "Sonntag"
-        ]
-        weekday_breakdown = []
-        for index, label in enumerate(weekday_labels):
-            value = weekday_hours.get(index, 0)
-            percentage = (value / total_weekday_hours * 100) if total_weekday_hours else 0
-            weekday_breakdown.append({
-                'label': label,
-                'hours': value,
-                'percentage': percentage
-            })
-        top_weekday = max(weekday_breakdown, key=lambda item: item['hours']) if total_weekday_hours else None
-        calm_weekday = min(
-            (item for item in weekday_breakdown if item['hours'] > 0),
-            key=lambda item: item['hours'],
-            default=None
-        )
-
-        total_shift_type_hours = sum(shift_type_hours.values())
-        shift_breakdown = []
-        for shift_type, value in sorted(shift_type_hours.items(), key=lambda item: item[1], reverse=True):
-            percentage = (value / total_shift_type_hours * 100) if total_shift_type_hours else 0
-            shift_breakdown.append({
-                'type': shift_type,
-                'hours': value,
-                'percentage': percentage
-            })
-
-        recent_months = monthly_data[-4:] if monthly_data else []
-        monthly_trend = None
-        if len(monthly_data) >= 2:
-            last_month = monthly_data[-1]
-            previous_month = monthly_data[-2]
-            difference = last_month['worked_hours'] - previous_month['worked_hours']
-            monthly_trend = {
-                'current': last_month,
-                'previous': previous_month,
-                'difference': difference,
-                'direction': 'up' if difference >= 0 else 'down'
-            }
-
-        completion_percentage = hours_summary.get('completion_percentage', 0)
-        progress_percentage = max(0, min(completion_percentage, 100))
-
-        remaining_hours = hours_summary.get('remaining_hours', 0)
-        proportional_target = hours_summary.get('proportional_target', 0)
-        worked_hours = hours_summary.get('worked_hours', 0)
-        overtime_hours = hours_summary.get('overtime_hours', 0)
-        shift_count = hours_summary.get('shift_count', 0)
-
-        recommendations = []
-        if remaining_hours > 0:
-            recommendations.append(
-                f"Du liegst {remaining_hours:.1f} Stunden unter dem Monatsziel. Plane zusätzliche Einsätze oder prüfe offene Schichten."
-            )
-        else:
-            recommendations.append(
-                "Du hast dein Monatsziel erreicht – nutze die Zeit für Ausgleich oder Weiterbildung."
-            )
-
-        if proportional_target and worked_hours < proportional_target:
-            deficit = proportional_target - worked_hours
-            recommendations.append(
-                f"Bis heute fehlen {deficit:.1f} Stunden zu den anteiligen Soll-Stunden. Kleine zusätzliche Einsätze gleichen das aus."
-            )
-        elif proportional_target:
-            surplus = worked_hours - proportional_target
-            recommendations.append(
-                f"Du liegst {surplus:.1f} Stunden vor dem anteiligen Soll – behalte deine Erholung im Blick."
-            )
-
-        if overtime_hours > 0:
-            recommendations.append(
-                f"Aktuell stehen {overtime_hours:.1f} Überstunden an. Prüfe Möglichkeiten zum Ausgleich oder zur Freigabe."
-            )
-        elif shift_count == 0:
-            recommendations.append(
-                "Es wurden noch keine genehmigten Schichten erfasst. Bitte reiche deine Zeiten zeitnah ein."
-            )
-
-        if len(recommendations) > 3:
-            recommendations = recommendations[:3]
-
         return render_template(
             "employee_hours_overview.html",
             employee=employee,
-            hours_summary=hours_summary,
-            monthly_data=monthly_data,
-            recent_months=recent_months,
-            monthly_trend=monthly_trend,
-            weekday_hours=weekday_hours,
-            weekday_breakdown=weekday_breakdown,
-            top_weekday=top_weekday,
-            calm_weekday=calm_weekday,
-            shift_type_hours=shift_type_hours,
-            shift_breakdown=shift_breakdown,
-            recommendations=recommendations,
-            progress_percentage=progress_percentage,
-            completion_percentage=completion_percentage,
-            current_month=current_month,
-            current_year=current_year
+            **_build_hours_dashboard(employee),
         )
 
+    @app.route("/api/employee/<int:emp_id>/hours")
+    @login_required
+    def employee_hours_data(emp_id: int):
+        """Liefert die Diagrammdaten der Stundenübersicht eines Mitarbeiters als JSON."""
+        if not session.get("is_admin") and session.get("user_id") != emp_id:
+            return jsonify({'error': 'Sie können nur Ihre eigenen Stunden abrufen.'}), 403
+
+        employee = Employee.query.get_or_404(emp_id)
+
+        # Abteilungsadministratoren sehen nur Mitarbeiter der eigenen Abteilung
+        if session.get("user_id") != emp_id:
+            current_user = get_current_user()
+            if (
+                current_user
+                and current_user.department_id
+                and employee.department_id != current_user.department_id
+            ):
+                return jsonify({'error': 'Sie können nur Stunden Ihrer Abteilung abrufen.'}), 403
+
+        dashboard = _build_hours_dashboard(employee)
+        response = jsonify({
+            'monthly_data': dashboard['monthly_data'],
+            'weekday_breakdown': dashboard['weekday_breakdown'],
+            'shift_breakdown': dashboard['shift_breakdown'],
+        })
+        # Persönliche Daten: nur im Browser zwischenspeichern
+        response.headers["Cache-Control"] = "private, max-age=60, stale-while-revalidate=300"
+        return response
+
     @app.route("/abwesenheit/antrag", methods=["GET", "POST"])
     @login_required
     def leave_form() -> str:
         """Formular zur Beantragung von Abwesenheiten."""
-        # Abteilungsbasierte Filterung für Mitarbeiterauswahl
-        current_user = get_current_user()
-        if current_user and current_user.department_id:
-            # Nur Mitarbeiter der eigenen Abteilung
-            employees = Employee.query.filter_by(department_id=current_user.department_id).all()
-        else:
-            # Super-Admin sieht alle Mitarbeiter
-            employees = Employee.query.all()
-        
         if request.method == "POST":
             # Wenn der Benutzer ein Admin ist, kann er einen Mitarbeiter auswählen.
             # Andernfalls wird die employee_id des angemeldeten Benutzers verwendet.
@@ -3415,8 +4183,8 @@ def create_app() -> Flask:
                 # current_employee wird am Ende der Funktion gesetzt
                 return redirect(url_for("leave_form"))
             
-            start_date = datetime.strptime(start_date_str, "%Y-%m-%d").date()
-            end_date = datetime.strptime(end_date_str, "%Y-%m-%d").date()
+            start_date = date.fromisoformat(start_date_str)
+            end_date = date.fromisoformat(end_date_str)
             
             # Abwesenheiten sind standardmäßig nicht genehmigt, außer bei 'Krank', die automatisch genehmigt werden.
             is_approved = True if leave_type == 'Krank' else False
@@ -3448,6 +4216,24 @@ def create_app() -> Flask:
             return redirect(url_for("index"))
         
         current_employee = Employee.query.get(session.get("user_id"))
+
+        # Die Mitarbeiterauswahl sehen nur Admins; sie zeigt lediglich ID und Name.
+        employees = []
+        if session.get("is_admin"):
+            employees_query = Employee.query.options(load_only(Employee.id, Employee.name))
+            # Abteilungsbasierte Filterung für Mitarbeiterauswahl
+            current_user = get_current_user()
+            if current_user and current_user.department_id:
+                # Nur Mitarbeiter der eigenen Abteilung
+                employees = (
+                    employees_query.filter_by(department_id=current_user.department_id)
+                    .order_by(Employee.id)
+                    .all()
+                )
+            else:
+                # Super-Admin sieht alle Mitarbeiter
+                employees = employees_query.all()
+
         return render_template("leave_form.html", employees=employees, current_employee=current_employee)
 
 
@@ -3459,7 +4245,6 @@ def create_app() -> Flask:
     def leave_requests() -> str:
         """Liste der offenen Abwesenheitsanträge."""
         from datetime import datetime
-        from sqlalchemy import func, extract
         
         # Abteilungsbasierte Filterung
         current_user = get_current_user()
@@ -3467,20 +4252,20 @@ def create_app() -> Flask:
         if current_user and current_user.department_id:
             # Nur Anträge der eigenen Abteilung
             # Ausstehende Anträge (ohne Krankheit)
-            pending_leaves = db.session.query(Leave).join(Employee).filter(
+            pending_leaves = db.session.query(Leave).join(Employee).options(joinedload(Leave.employee)).filter(
                 Leave.approved == False,
                 Leave.leave_type != 'Krank',
                 Employee.department_id == current_user.department_id
             ).order_by(Leave.start_date).all()
             
             # Krankheitsanträge (ausstehend und genehmigt)
-            sick_leaves = db.session.query(Leave).join(Employee).filter(
+            sick_leaves = db.session.query(Leave).join(Employee).options(joinedload(Leave.employee)).filter(
                 Leave.leave_type == 'Krank',
                 Employee.department_id == current_user.department_id
-            ).order_by(Leave.start_date.desc()).all()
+            ).order_by(Leave.start_date.desc(), Leave.id).all()
             
             # Genehmigte Abwesenheiten (ohne Krankheit)
-            approved_leaves = db.session.query(Leave).join(Employee).filter(
+            approved_leaves = db.session.query(Leave).join(Employee).options(joinedload(Leave.employee)).filter(
                 Leave.approved == True,
                 Leave.leave_type != 'Krank',
                 Employee.department_id == current_user.department_id
@@ -3489,21 +4274,7 @@ def create_app() -> Flask:
             # Chart-Daten für die eigene Abteilung (Krankheitstage pro Mitarbeiter im aktuellen Monat)
             current_month = datetime.now().month
             current_year = datetime.now().year
-            
-            chart_data_raw = db.session.query(
-                Employee.name,
-                func.sum(
-                    func.julianday(Leave.end_date) - func.julianday(Leave.start_date) + 1
-                ).label('total_days')
-            ).join(Leave).filter(
-                Leave.leave_type == 'Krank',
-                Employee.department_id == current_user.department_id,
-                extract('year', Leave.start_date) == current_year,
-                extract('month', Leave.start_date) == current_month
-            ).group_by(Employee.id, Employee.name).all()
-            
-            # Convert Row objects to list of lists for JSON serialization
-            chart_data = [[row[0], float(row[1])] for row in chart_data_raw]
+            chart_data = _sick_days_chart(current_year, current_month, current_user.department_id)
             
             departments = [current_user.department]
             selected_department_id = current_user.department_id
@@ -3511,18 +4282,18 @@ def create_app() -> Flask:
         else:
             # Super-Admin ohne Abteilung sieht alle
             # Ausstehende Anträge (ohne Krankheit)
-            pending_leaves = Leave.query.filter(
+            pending_leaves = Leave.query.options(joinedload(Leave.employee)).filter(
                 Leave.approved == False,
                 Leave.leave_type != 'Krank'
             ).order_by(Leave.start_date).all()
             
             # Krankheitsanträge (ausstehend und genehmigt)
-            sick_leaves = Leave.query.filter(
+            sick_leaves = Leave.query.options(joinedload(Leave.employee)).filter(
                 Leave.leave_type == 'Krank'
-            ).order_by(Leave.start_date.desc()).all()
+            ).order_by(Leave.start_date.desc(), Leave.id).all()
             
             # Genehmigte Abwesenheiten (ohne Krankheit)
-            approved_leaves = Leave.query.filter(
+            approved_leaves = Leave.query.options(joinedload(Leave.employee)).filter(
                 Leave.approved == True,
                 Leave.leave_type != 'Krank'
             ).order_by(Leave.start_date).all()
@@ -3532,37 +4303,8 @@ def create_app() -> Flask:
             current_month = datetime.now().month
             current_year = datetime.now().year
             
-            if selected_department_id:
-                # Spezifische Abteilung
-                chart_data_raw = db.session.query(
-                    Employee.name,
-                    func.sum(
-                        func.julianday(Leave.end_date) - func.julianday(Leave.start_date) + 1
-                    ).label('total_days')
-                ).join(Leave).filter(
-                    Leave.leave_type == 'Krank',
-                    Employee.department_id == selected_department_id,
-                    extract('year', Leave.start_date) == current_year,
-                    extract('month', Leave.start_date) == current_month
-                ).group_by(Employee.id, Employee.name).all()
-                
-                # Convert Row objects to list of lists for JSON serialization
-                chart_data = [[row[0], float(row[1])] for row in chart_data_raw]
-            else:
-                # Alle Abteilungen zusammengefasst
-                chart_data_raw = db.session.query(
-                    Employee.name,
-                    func.sum(
-                        func.julianday(Leave.end_date) - func.julianday(Leave.start_date) + 1
-                    ).label('total_days')
-                ).join(Leave).filter(
-                    Leave.leave_type == 'Krank',
-                    extract('year', Leave.start_date) == current_year,
-                    extract('month', Leave.start_date) == current_month
-                ).group_by(Employee.id, Employee.name).all()
-                
-                # Convert Row objects to list of lists for JSON serialization
-                chart_data = [[row[0], float(row[1])] for row in chart_data_raw]
+            # Ohne Auswahl werden alle Abteilungen zusammengefasst
+            chart_data = _sick_days_chart(current_year, current_month, selected_department_id)
             
             departments = Department.query.all()
             
@@ -3581,7 +4323,11 @@ def create_app() -> Flask:
     @admin_required
     def approve_leave(leave_id: int) -> str:
         """Genehmigt einen Abwesenheitsantrag."""
-        leave = Leave.query.get_or_404(leave_id)
+        leave = (
+            Leave.query.options(joinedload(Leave.employee))
+            .filter_by(id=leave_id)
+            .first_or_404()
+        )
         leave.approved = True
         request_message = _build_leave_request_message(
             leave.employee,
@@ -3611,7 +4357,11 @@ def create_app() -> Flask:
     @admin_required
     def decline_leave(leave_id: int) -> str:
         """Lehnt einen Abwesenheitsantrag ab (löscht ihn)."""
-        leave = Leave.query.get_or_404(leave_id)
+        leave = (
+            Leave.query.options(joinedload(Leave.employee))
+            .filter_by(id=leave_id)
+            .first_or_404()
+        )
         request_message = _build_leave_request_message(
             leave.employee,
             leave.leave_type,
@@ -3649,44 +4399,37 @@ def create_app() -> Flask:
     def save_productivity_settings() -> str:
         """Speichert die Produktivitätseinstellungen."""
         try:
-            # Globale Einstellung
+            # Neue Werte je Abteilung (None = global); leere Felder bleiben unverändert
+            new_values: Dict[int | None, float] = {}
             global_value = request.form.get("global_productivity", type=float)
             if global_value:
-                # Deaktiviere alte globale Einstellungen
-                old_global = ProductivitySettings.query.filter_by(
-                    department_id=None, is_active=True
-                ).all()
-                for setting in old_global:
-                    setting.is_active = False
-                
-                # Erstelle neue globale Einstellung
-                new_global = ProductivitySettings(
-                    department_id=None,
-                    productivity_value=global_value,
-                    is_active=True
-                )
-                db.session.add(new_global)
-            
-            # Abteilungsspezifische Einstellungen
-            departments = Department.query.all()
-            for dept in departments:
-                dept_value = request.form.get(f"dept_{dept.id}_productivity", type=float)
+                new_values[None] = global_value
+            for (dept_id,) in db.session.query(Department.id).order_by(Department.id):
+                dept_value = request.form.get(f"dept_{dept_id}_productivity", type=float)
                 if dept_value:
-                    # Deaktiviere alte Einstellungen für diese Abteilung
-                    old_dept = ProductivitySettings.query.filter_by(
-                        department_id=dept.id, is_active=True
-                    ).all()
-                    for setting in old_dept:
-                        setting.is_active = False
-                    
-                    # Erstelle neue Einstellung für diese Abteilung
-                    new_dept = ProductivitySettings(
-                        department_id=dept.id,
-                        productivity_value=dept_value,
-                        is_active=True
+                    new_values[dept_id] = dept_value
+
+            if new_values:
+                # Alte Einstellungen der betroffenen Bereiche mit einem UPDATE deaktivieren
+                dept_ids = [dept_id for dept_id in new_values if dept_id is not None]
+                scope = []
+                if None in new_values:
+                    scope.append(ProductivitySettings.department_id.is_(None))
+                if dept_ids:
+                    scope.append(ProductivitySettings.department_id.in_(dept_ids))
+                ProductivitySettings.query.filter(
+                    ProductivitySettings.is_active == True, or_(*scope)
+                ).update({"is_active": False}, synchronize_session=False)
+
+                db.session.add_all(
+                    ProductivitySettings(
+                        department_id=dept_id,
+                        productivity_value=value,
+                        is_active=True,
                     )
-                    db.session.add(new_dept)
-            
+                    for dept_id, value in new_values.items()
+                )
+
             db.session.commit()
             flash("Produktivitätseinstellungen wurden gespeichert.", "success")
         except Exception as e:
@@ -3867,10 +4610,13 @@ def create_app() -> Flask:
     def backup_mode() -> str:
         """Spezialbereich für Backups und Notfallmaßnahmen."""
 
-        employee_count = Employee.query.count()
-        department_count = Department.query.count()
-        shift_count = Shift.query.count()
-        leave_count = Leave.query.count()
+        # Alle vier Zählungen als skalare Unterabfragen einer einzigen Abfrage
+        employee_count, department_count, shift_count, leave_count = db.session.execute(
+            select(*(
+                select(func.count()).select_from(model).scalar_subquery()
+                for model in (Employee, Department, Shift, Leave)
+            ))
+        ).one()
 
         backup_stats = [
             {"label": "Gespeicherte Mitarbeitende", "value": employee_count},
@@ -3885,10 +4631,7 @@ def create_app() -> Flask:
         db_file_size = "Nicht verfügbar"
 
         if db_file_path:
-            if db_file_path.exists():
-                db_file_size = _format_file_size(db_file_path.stat().st_size)
-            else:
-                db_file_size = "Datei nicht gefunden"
+            db_file_size = _get_database_file_size(db_file_path)
 
         return render_template(
             "settings_backup.html",
@@ -3974,6 +4717,14 @@ def create_app() -> Flask:
             db.session.remove()
             db.drop_all()
             db.create_all()
+            _load_employee_positions.cache_clear()
+            _load_department_options.cache_clear()
+            _load_productivity_settings.cache_clear()
+            _load_work_classes.cache_clear()
+            _load_productivity_for_dates.cache_clear()
+            _load_past_monthly_hours.cache_clear()
+            _employee_has_approved_shifts.cache_clear()
+            _clear_report_page_cache()
         except Exception as exc:  # pragma: no cover - sicherheitsrelevante Fehlerbehandlung
             db.session.rollback()
             current_app.logger.exception("Fehler beim Zurücksetzen der Datenbank", exc_info=exc)
@@ -4031,12 +4782,10 @@ def create_app() -> Flask:
 
         if not name:
             errors.append("Bitte geben Sie einen Namen für die Arbeitsklasse an.")
-        else:
-            existing = WorkClass.query.filter(
-                func.lower(WorkClass.name) == name.lower()
-            ).first()
-            if existing:
-                errors.append("Es existiert bereits eine Arbeitsklasse mit diesem Namen.")
+        elif db.session.query(
+            exists().where(func.lower(WorkClass.name) == name.lower())
+        ).scalar():
+            errors.append("Es existiert bereits eine Arbeitsklasse mit diesem Namen.")
 
         hours_per_week = None
         if hours_per_week_raw is not None:
@@ -4075,11 +4824,11 @@ def create_app() -> Flask:
         )
 
         if set_default:
-            for existing_default in WorkClass.query.filter_by(is_default=True).all():
-                existing_default.is_default = False
             new_work_class.is_default = True
 
         try:
+            if set_default:
+                _clear_default_work_classes()
             db.session.add(new_work_class)
             db.session.commit()
             flash(f"Arbeitsklasse '{new_work_class.name}' wurde angelegt.", "success")
@@ -4103,15 +4852,16 @@ def create_app() -> Flask:
 
         errors: List[str] = []
 
-        if name:
-            existing = WorkClass.query.filter(
+        if not name:
+            errors.append("Der Name darf nicht leer sein.")
+        # Ein unveränderter Name wurde bereits beim letzten Speichern geprüft.
+        elif name != work_class.name and db.session.query(
+            exists().where(
                 func.lower(WorkClass.name) == name.lower(),
                 WorkClass.id != work_class.id,
-            ).first()
-            if existing:
-                errors.append("Eine andere Arbeitsklasse verwendet bereits diesen Namen.")
-        else:
-            errors.append("Der Name darf nicht leer sein.")
+            )
+        ).scalar():
+            errors.append("Eine andere Arbeitsklasse verwendet bereits diesen Namen.")
 
         try:
             parsed_week = _parse_hours_value(hours_per_week_raw)
@@ -4140,14 +4890,13 @@ def create_app() -> Flask:
         work_class.description = description or None
         work_class.color = color
 
-        if set_default:
-            for existing_default in WorkClass.query.filter_by(is_default=True).all():
-                if existing_default.id != work_class.id:
-                    existing_default.is_default = False
-            work_class.is_default = True
-            work_class.is_active = True
-
         try:
+            if set_default:
+                # Erst die bisherige Standardklasse zurücksetzen; der eindeutige
+                # Index erlaubt nur eine Standardklasse zur selben Zeit.
+                _clear_default_work_classes(keep_id=work_class.id)
+                work_class.is_default = True
+                work_class.is_active = True
             db.session.commit()
             flash(f"Arbeitsklasse '{work_class.name}' wurde aktualisiert.", "success")
         except IntegrityError:
@@ -4164,26 +4913,28 @@ def create_app() -> Flask:
         if not work_class.is_active and work_class.is_default:
             work_class.is_default = False
 
+        # Vor dem Commit lesen, damit danach kein erneutes Laden nötig ist
+        status = "reaktiviert" if work_class.is_active else "deaktiviert"
+        message = f"Arbeitsklasse '{work_class.name}' wurde {status}."
         db.session.commit()
 
-        status = "reaktiviert" if work_class.is_active else "deaktiviert"
-        flash(f"Arbeitsklasse '{work_class.name}' wurde {status}.", "success")
+        flash(message, "success")
         return redirect(url_for("system_settings"))
 
     @app.route("/settings/work-classes/<int:class_id>/standard", methods=["POST"])
     @super_admin_required
     def set_default_work_class(class_id: int) -> str:
         work_class = WorkClass.query.get_or_404(class_id)
+        work_class_name = work_class.name
 
-        for existing_default in WorkClass.query.filter_by(is_default=True).all():
-            if existing_default.id != work_class.id:
-                existing_default.is_default = False
-
+        # SQLite prüft den eindeutigen Standard-Index je Zeile; daher zuerst die
+        # übrigen Standardklassen zurücksetzen und dann die neue markieren.
+        _clear_default_work_classes(keep_id=class_id)
         work_class.is_default = True
         work_class.is_active = True
         db.session.commit()
 
-        flash(f"'{work_class.name}' ist jetzt die Standard-Arbeitsklasse.", "success")
+        flash(f"'{work_class_name}' ist jetzt die Standard-Arbeitsklasse.", "success")
         return redirect(url_for("system_settings"))
 
     @app.route("/settings/work-classes/<int:class_id>/loeschen", methods=["POST"])
@@ -4208,69 +4959,72 @@ def create_app() -> Flask:
 
         _process_due_automations()
 
-        automations = ApprovalAutomation.query.order_by(ApprovalAutomation.created_at.desc()).all()
-
-        position_rows = (
-            Employee.query.with_entities(Employee.position)
-            .filter(Employee.position.isnot(None), Employee.position != "")
-            .distinct()
-            .order_by(Employee.position.asc())
+        # raiseload macht vergessene Eager-Loads sofort als Fehler sichtbar
+        automations = (
+            ApprovalAutomation.query.options(raiseload("*", sql_only=True))
+            .order_by(ApprovalAutomation.created_at.desc())
             .all()
         )
-        positions = []
-        seen_positions = set()
-        for row in position_rows:
-            value = (row[0] or "").strip()
-            if value and value not in seen_positions:
-                positions.append(value)
-                seen_positions.add(value)
 
+        # Positionen bereinigt und eindeutig direkt aus der Datenbank
+        trimmed_position = func.trim(Employee.position)
+        positions = [
+            position
+            for (position,) in db.session.query(trimmed_position)
+            .filter(Employee.position.isnot(None), trimmed_position != "")
+            .distinct()
+            .order_by(trimmed_position.asc())
+        ]
+
+        # Kennzahlen in einem Durchlauf über alle Automatisierungen
         now = datetime.now()
-        active_count = sum(1 for automation in automations if automation.is_active)
-        inactive_count = sum(1 for automation in automations if not automation.is_active)
-        next_runs = [automation.next_run for automation in automations if automation.next_run]
-        upcoming_run = min(next_runs) if next_runs else None
-        overdue_automations = [
-            automation
-            for automation in automations
-            if automation.next_run and automation.next_run <= now
+        recent_cutoff = now - timedelta(hours=24)
+        active_count = 0
+        upcoming_run = None
+        overdue_count = 0
+        runs_last_24h = 0
+        type_counts: Counter = Counter()
+        for automation in automations:
+            if automation.is_active:
+                active_count += 1
+            next_run = automation.next_run
+            if next_run:
+                if upcoming_run is None or next_run < upcoming_run:
+                    upcoming_run = next_run
+                if next_run <= now:
+                    overdue_count += 1
+            last_run = automation.last_run
+            if last_run and last_run >= recent_cutoff:
+                runs_last_24h += 1
+            type_counts[automation.automation_type] += 1
+        inactive_count = len(automations) - active_count
+        recent_runs = heapq.nlargest(
+            5,
+            (automation for automation in automations if automation.last_run),
+            key=attrgetter("last_run"),
+        )
+        type_statistics = [
+            {"label": label, "count": type_counts[value]}
+            for value, label in AUTOMATION_TYPE_CHOICES
         ]
-        runs_last_24h = sum(
-            1
+        # Die Termine werden nur erzeugt und nicht gesammelt; aufbereitet werden
+        # allein die zehn frühesten
+        forecast_runs = (
+            (occurrence, automation.id, index, automation)
             for automation in automations
-            if automation.last_run and now - automation.last_run <= timedelta(hours=24)
+            for index, occurrence in enumerate(_forecast_automation_runs(automation, limit=3))
         )
-        recent_runs = sorted(
-            [automation for automation in automations if automation.last_run],
-            key=lambda automation: automation.last_run or datetime.min,
-            reverse=True,
-        )[:5]
-        type_statistics = [
+        timeline_entries = [
             {
-                "label": label,
-                "count": sum(
-                    1 for automation in automations if automation.automation_type == value
-                ),
+                "automation": automation,
+                "scheduled_time": occurrence,
+                "is_primary": index == 0,
+                "is_overdue": occurrence <= now,
             }
-            for value, label in AUTOMATION_TYPE_CHOICES
+            for occurrence, _, index, automation in heapq.nsmallest(
+                10, forecast_runs, key=itemgetter(0, 1)
+            )
         ]
-        timeline_entries: List[dict] = []
-        for automation in automations:
-            for index, occurrence in enumerate(_forecast_automation_runs(automation, limit=3)):
-                timeline_entries.append(
-                    {
-                        "automation": automation,
-                        "scheduled_time": occurrence,
-                        "is_primary": index == 0,
-                        "is_overdue": occurrence <= now,
-                    }
-                )
-        timeline_entries.sort(key=lambda entry: (entry["scheduled_time"], entry["automation"].id))
-        timeline_entries = timeline_entries[:10]
-
-        type_labels = dict(AUTOMATION_TYPE_CHOICES)
-        schedule_labels = dict(SCHEDULE_CHOICES)
-        weekday_map = {code: label for code, label in WEEKDAY_LABELS}
 
         return render_template(
             "automated_approvals.html",
@@ -4280,15 +5034,15 @@ def create_app() -> Flask:
             weekday_labels=WEEKDAY_LABELS,
             active_count=active_count,
             upcoming_run=upcoming_run,
-            overdue_count=len(overdue_automations),
+            overdue_count=overdue_count,
             runs_last_24h=runs_last_24h,
             inactive_count=inactive_count,
             timeline_entries=timeline_entries,
             recent_runs=recent_runs,
             type_statistics=type_statistics,
-            type_labels=type_labels,
-            schedule_labels=schedule_labels,
-            weekday_map=weekday_map,
+            type_labels=_AUTOMATION_TYPE_LABELS,
+            schedule_labels=_SCHEDULE_LABELS,
+            weekday_map=_WEEKDAY_LABEL_MAP,
             positions=positions,
         )
 
@@ -4309,13 +5063,11 @@ def create_app() -> Flask:
             flash("Bitte vergeben Sie einen Namen für die Automatisierung.", "danger")
             return redirect(url_for("automated_approvals"))
 
-        valid_types = {choice[0] for choice in AUTOMATION_TYPE_CHOICES}
-        if automation_type not in valid_types:
+        if automation_type not in _VALID_AUTOMATION_TYPES:
             flash("Der ausgewählte Automatisierungstyp ist ungültig.", "danger")
             return redirect(url_for("automated_approvals"))
 
-        valid_schedules = {choice[0] for choice in SCHEDULE_CHOICES}
-        if schedule_type not in valid_schedules:
+        if schedule_type not in _VALID_SCHEDULES:
             flash("Der ausgewählte Zeitplan ist ungültig.", "danger")
             return redirect(url_for("automated_approvals"))
 
@@ -4339,7 +5091,7 @@ def create_app() -> Flask:
                 flash("Für eine einmalige Automatisierung sind Datum und Uhrzeit erforderlich.", "danger")
                 return redirect(url_for("automated_approvals"))
             try:
-                run_date = datetime.strptime(once_date_raw, "%Y-%m-%d").date()
+                run_date = date.fromisoformat(once_date_raw)
             except ValueError:
                 flash("Bitte geben Sie ein gültiges Datum an.", "danger")
                 return redirect(url_for("automated_approvals"))
@@ -4366,18 +5118,10 @@ def create_app() -> Flask:
                 flash("Bitte wählen Sie die gewünschte Mitarbeitergruppe aus.", "danger")
                 return redirect(url_for("automated_approvals"))
 
-            position_rows = (
-                Employee.query.with_entities(Employee.position)
-                .filter(Employee.position.isnot(None), Employee.position != "")
-                .distinct()
-                .all()
-            )
-            valid_positions = {
-                (row[0] or "").strip()
-                for row in position_rows
-                if (row[0] or "").strip()
-            }
-            if target_position not in valid_positions:
+            position_exists = db.session.query(
+                exists().where(func.trim(Employee.position) == target_position)
+            ).scalar()
+            if not position_exists:
                 flash("Die ausgewählte Mitarbeitergruppe ist ungültig.", "danger")
                 return redirect(url_for("automated_approvals"))
         else:
@@ -4457,11 +5201,17 @@ def create_app() -> Flask:
         from datetime import date
         today = date.today()
         current_user = get_current_user()
-        employee_query = Employee.query.order_by(Employee.name.asc())
+        # Die Auswahllisten zeigen nur ID, Name und Position; jeder weitere
+        # Spalten- oder Beziehungszugriff löst einen Fehler statt einer Abfrage aus
+        employee_query = Employee.query.options(
+            load_only(Employee.id, Employee.name, Employee.position, raiseload=True),
+            raiseload("*", sql_only=True),
+        ).order_by(Employee.name.asc())
         if current_user and current_user.department_id:
             employee_query = employee_query.filter_by(department_id=current_user.department_id)
 
         employees = employee_query.all()
+        # Aus den ohnehin geladenen Zeilen, ohne weitere Abfrage
         positions = sorted({emp.position for emp in employees if emp.position})
 
         return render_template(
@@ -4500,14 +5250,13 @@ def create_app() -> Flask:
                     return redirect(url_for("auto_schedule_form"))
 
                 if restricted_department_id:
-                    allowed_positions = {
-                        emp.position
-                        for emp in Employee.query.filter_by(
-                            department_id=restricted_department_id
+                    position_allowed = db.session.query(
+                        exists().where(
+                            Employee.department_id == restricted_department_id,
+                            Employee.position == position,
                         )
-                        if emp.position
-                    }
-                    if position not in allowed_positions:
+                    ).scalar()
+                    if not position_allowed:
                         flash(
                             "Sie können nur Positionen aus Ihrer Abteilung auswählen.",
                             "danger",
@@ -4533,12 +5282,17 @@ def create_app() -> Flask:
                     flash("Bitte wählen Sie einen Mitarbeiter aus.", "warning")
                     return redirect(url_for("auto_schedule_form"))
 
-                employee = Employee.query.get(employee_id)
+                # Nur der Name wird benötigt; die Abteilungsprüfung läuft in derselben Abfrage.
+                employee_name_query = db.session.query(Employee.name).filter(
+                    Employee.id == employee_id
+                )
+                if restricted_department_id:
+                    employee_name_query = employee_name_query.filter(
+                        Employee.department_id == restricted_department_id
+                    )
+                employee_name = employee_name_query.scalar()
 
-                if not employee or (
-                    restricted_department_id
-                    and employee.department_id != restricted_department_id
-                ):
+                if employee_name is None:
                     flash(
                         "Sie können nur Mitarbeiter aus Ihrer Abteilung auswählen.",
                         "danger",
@@ -4554,9 +5308,9 @@ def create_app() -> Flask:
                 )
 
                 if dry_run:
-                    flash(f"Vorschau: {result['total_created']} Schichten würden für {employee.name} erstellt, {result['total_skipped']} übersprungen.", "info")
+                    flash(f"Vorschau: {result['total_created']} Schichten würden für {employee_name} erstellt, {result['total_skipped']} übersprungen.", "info")
                 else:
-                    flash(f"{result['total_created']} Schichten für {employee.name} erstellt, {result['total_skipped']} übersprungen.", "success")
+                    flash(f"{result['total_created']} Schichten für {employee_name} erstellt, {result['total_skipped']} übersprungen.", "success")
 
             else:  # mode == "all"
                 result = create_default_shifts_for_month(
@@ -4600,14 +5354,7 @@ def create_app() -> Flask:
                 return render_template("add_blocked_day.html", date=date, today=today_str)
             
             try:
-                blocked_date = datetime.strptime(date_str, "%Y-%m-%d").date()
-                
-                # Prüfen, ob das Datum bereits gesperrt ist
-                existing = BlockedDay.query.filter_by(date=blocked_date).first()
-                if existing:
-                    flash(f"Das Datum {blocked_date.strftime('%d.%m.%Y')} ist bereits als '{existing.name}' gesperrt.", "warning")
-                    today_str = date.today().strftime('%Y-%m-%d')
-                    return render_template("add_blocked_day.html", date=date, today=today_str)
+                blocked_date = date.fromisoformat(date_str)
                 
                 blocked_day = BlockedDay(
                     date=blocked_date,
@@ -4617,8 +5364,23 @@ def create_app() -> Flask:
                     created_by=session.get("user_id")
                 )
                 
+                # Das Datum ist eindeutig; ein bereits gesperrter Tag wird erst
+                # nach dem fehlgeschlagenen Einfügen nachgeschlagen.
                 db.session.add(blocked_day)
-                db.session.commit()
+                try:
+                    db.session.commit()
+                except IntegrityError:
+                    db.session.rollback()
+                    existing_name = (
+                        db.session.query(BlockedDay.name)
+                        .filter_by(date=blocked_date)
+                        .scalar()
+                    )
+                    if existing_name is None:
+                        raise
+                    flash(f"Das Datum {blocked_date.strftime('%d.%m.%Y')} ist bereits als '{existing_name}' gesperrt.", "warning")
+                    today_str = date.today().strftime('%Y-%m-%d')
+                    return render_template("add_blocked_day.html", date=date, today=today_str)
                 flash(f"Gesperrter Tag '{name}' am {blocked_date.strftime('%d.%m.%Y')} wurde hinzugefügt.", "success")
                 return redirect(url_for("blocked_days"))
                 
@@ -4686,6 +5448,58 @@ def create_app() -> Flask:
 
         return counts
 
+    def _contact_length_columns():
+        """Liefert die getrimmten Längen von E-Mail und Telefon als SQL-Ausdrücke."""
+
+        # Die leere Zeichenkette wird als Literal ausgegeben, damit SQLite die
+        # Ausdrucksindizes auf length(trim(coalesce(...))) verwenden kann.
+        empty = literal_column("''")
+        return (
+            func.length(func.trim(func.coalesce(Employee.email, empty))),
+            func.length(func.trim(func.coalesce(Employee.phone, empty))),
+        )
+
+    def _calculate_role_counts_sql(query):
+        """Zählt Rollen, Kontaktangaben und Abteilungen per GROUP BY in der Datenbank.
+
+        Gibt ein Tupel aus Rollen-, Kontakt- und Abteilungszählern zurück, ohne
+        die Benutzer selbst zu laden.
+        """
+
+        email_length, phone_length = _contact_length_columns()
+        is_admin = Employee.is_admin.is_(True)
+        rows = (
+            query.with_entities(
+                Employee.department_id,
+                func.count(),
+                func.count().filter(is_admin),
+                func.count().filter(email_length > 0, phone_length > 0),
+                func.count().filter(email_length == 0),
+                func.count().filter(phone_length == 0),
+            )
+            .group_by(Employee.department_id)
+            .all()
+        )
+
+        role_counts = {"total": 0, "super_admin": 0, "department_admin": 0, "employee": 0}
+        contact_counts: Dict[str, int] = {"complete": 0, "missing_email": 0, "missing_phone": 0}
+        department_counts: Dict[str, Dict[str, int]] = {}
+
+        for department_id, total, admins, complete, missing_email, missing_phone in rows:
+            role_counts["total"] += total
+            role_counts["super_admin" if department_id is None else "department_admin"] += admins
+            role_counts["employee"] += total - admins
+            contact_counts["complete"] += complete
+            contact_counts["missing_email"] += missing_email
+            contact_counts["missing_phone"] += missing_phone
+            key = str(department_id) if department_id is not None else "none"
+            department_counts[key] = {"total": total, "admins": admins}
+
+        contact_counts["incomplete"] = role_counts["total"] - contact_counts["complete"]
+        contact_counts["all"] = role_counts["total"]
+
+        return role_counts, contact_counts, department_counts
+
     def _apply_user_filters(
         query,
         *,
@@ -4697,12 +5511,14 @@ def create_app() -> Flask:
         """Wendet Such- und Filterparameter auf die Benutzerabfrage an."""
 
         if search_query:
+            # ILIKE ergibt auf SQLite lower(...) LIKE lower(...) und kann auf
+            # PostgreSQL Trigramm-Indizes nutzen.
             like_pattern = f"%{search_query.lower()}%"
             query = query.filter(
                 or_(
-                    func.lower(Employee.name).like(like_pattern),
-                    func.lower(Employee.username).like(like_pattern),
-                    func.lower(Employee.email).like(like_pattern),
+                    Employee.name.ilike(like_pattern),
+                    Employee.username.ilike(like_pattern),
+                    Employee.email.ilike(like_pattern),
                 )
             )
 
@@ -4724,25 +5540,16 @@ def create_app() -> Flask:
             if department_id:
                 query = query.filter(Employee.department_id == department_id)
 
-        trimmed_email = func.trim(func.coalesce(Employee.email, ""))
-        trimmed_phone = func.trim(func.coalesce(Employee.phone, ""))
+        email_length, phone_length = _contact_length_columns()
 
         if contact == "complete":
-            query = query.filter(
-                func.length(trimmed_email) > 0,
-                func.length(trimmed_phone) > 0,
-            )
+            query = query.filter(email_length > 0, phone_length > 0)
         elif contact == "missing_email":
-            query = query.filter(func.length(trimmed_email) == 0)
+            query = query.filter(email_length == 0)
         elif contact == "missing_phone":
-            query = query.filter(func.length(trimmed_phone) == 0)
+            query = query.filter(phone_length == 0)
         elif contact == "incomplete":
-            query = query.filter(
-                or_(
-                    func.length(trimmed_email) == 0,
-                    func.length(trimmed_phone) == 0,
-                )
-            )
+            query = query.filter(or_(email_length == 0, phone_length == 0))
 
         return query
 
@@ -4816,8 +5623,6 @@ def create_app() -> Flask:
         if view_mode not in {"table", "cards"}:
             view_mode = "table"
 
-        scoped_users = base_query.options(joinedload(Employee.department)).all()
-
         filtered_query = _apply_user_filters(
             base_query,
             search_query=search_query,
@@ -4826,39 +5631,17 @@ def create_app() -> Flask:
             contact=contact_filter,
         )
         sorted_query = _apply_user_sort(filtered_query, sort_option)
-        users = sorted_query.options(joinedload(Employee.department)).all()
+        # Das Template benötigt nur die Abteilung; alle anderen Beziehungen
+        # sind gesperrt, damit keine N+1-Abfragen unbemerkt entstehen
+        users = sorted_query.options(
+            joinedload(Employee.department), raiseload("*", sql_only=True)
+        ).all()
 
-        role_counts_total = _calculate_role_counts(scoped_users)
+        # Die Gesamtzahlen stammen aus einer Aggregatabfrage; nur die sichtbaren
+        # Benutzer werden geladen, da sie ohnehin gerendert werden.
+        role_counts_total, contact_counts, department_counts = _calculate_role_counts_sql(base_query)
         role_counts_visible = _calculate_role_counts(users)
 
-        contact_counts: Dict[str, int] = {
-            "complete": 0,
-            "missing_email": 0,
-            "missing_phone": 0,
-        }
-
-        for user in scoped_users:
-            has_email = bool(user.email and user.email.strip())
-            has_phone = bool(user.phone and user.phone.strip())
-
-            if has_email and has_phone:
-                contact_counts["complete"] += 1
-            else:
-                if not has_email:
-                    contact_counts["missing_email"] += 1
-                if not has_phone:
-                    contact_counts["missing_phone"] += 1
-
-        contact_counts["incomplete"] = role_counts_total["total"] - contact_counts["complete"]
-        contact_counts["all"] = role_counts_total["total"]
-
-        department_counts: Dict[str, Dict[str, int]] = defaultdict(lambda: {"total": 0, "admins": 0})
-        for user in scoped_users:
-            key = str(user.department_id) if user.department_id is not None else "none"
-            department_counts[key]["total"] += 1
-            if user.is_admin:
-                department_counts[key]["admins"] += 1
-
         department_overview = []
         for department in departments:
             stats = department_counts.get(str(department.id))
@@ -5252,7 +6035,9 @@ def create_app() -> Flask:
             contact=contact_filter,
         )
         sorted_query = _apply_user_sort(filtered_query, sort_option)
-        users = sorted_query.options(joinedload(Employee.department)).all()
+        users = sorted_query.options(
+            joinedload(Employee.department), raiseload("*", sql_only=True)
+        ).all()
 
         output = StringIO()
         writer = csv.writer(output, delimiter=";")
@@ -5388,7 +6173,6 @@ def create_app() -> Flask:
     @login_required
     def get_employee_group_order():
         """Gibt die aktuelle Reihenfolge der Benutzergruppen zurück."""
-        from models import EmployeeGroupOrder
         from flask import jsonify
 
         group_order_entries = EmployeeGroupOrder.query.order_by(EmployeeGroupOrder.order_position).all()
@@ -5418,7 +6202,6 @@ def create_app() -> Flask:
     @admin_required
     def update_employee_group_order():
         """Aktualisiert die Reihenfolge der Benutzergruppen (nur für Systemadmins)."""
-        from models import EmployeeGroupOrder
         from flask import jsonify
         
         current_user = get_current_user()
@@ -47,7 +47,7 @@ def create_default_shifts_for_month(
         )
         if department_id:
             employee_query = employee_query.filter_by(department_id=department_id)
-        employees = employee_query.all()
+        employees = employee_query.order_by(Employee.id).all()
     
     created_shifts = []
     skipped_shifts = []
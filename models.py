@@ -8,7 +8,8 @@ SQLAlchemy und stellen die Grundlage für die gesamte Anwendung dar.
 from datetime import date, datetime
 from flask_sqlalchemy import SQLAlchemy
 from sqlalchemy import inspect, text
-from sqlalchemy.exc import NoSuchTableError, OperationalError, ProgrammingError
+from sqlalchemy.exc import IntegrityError, NoSuchTableError, OperationalError, ProgrammingError
+from sqlalchemy.schema import CreateIndex
 
 # Die SQLAlchemy‑Instanz wird in app.py initialisiert und hier importiert.
 db = SQLAlchemy()
@@ -29,7 +30,9 @@ class Department(db.Model):
     color = db.Column(db.String(20), nullable=True)
     area = db.Column(db.String(120), nullable=True)
 
-    employees = db.relationship("Employee", backref="department", lazy=True)
+    employees = db.relationship(
+        "Employee", backref="department", lazy=True, order_by="Employee.id"
+    )
 
     def __repr__(self) -> str:
         return f"<Department {self.name}>"
@@ -45,6 +48,23 @@ class Employee(db.Model):
     """
 
     __tablename__ = "employee"
+    __table_args__ = (
+        # Unterstützt die Filter nach Abteilung und Position in Listen und Berichten.
+        db.Index("ix_employee_department_position", "department_id", "position"),
+        # Eindeutiger Index für die Anmeldung; wird auch in älteren Datenbanken
+        # nachgezogen, deren Spalte per ALTER TABLE ohne UNIQUE ergänzt wurde.
+        db.Index("ux_employee_username", "username", unique=True),
+        # Für die Kontaktdaten-Filter der Benutzerverwaltung; die Ausdrücke
+        # entsprechen exakt denen in der Abfrage (leere Zeichenkette als Literal).
+        db.Index(
+            "ix_employee_email_trimmed_length",
+            db.func.length(db.func.trim(db.func.coalesce(text("email"), text("''")))),
+        ),
+        db.Index(
+            "ix_employee_phone_trimmed_length",
+            db.func.length(db.func.trim(db.func.coalesce(text("phone"), text("''")))),
+        ),
+    )
 
     id = db.Column(db.Integer, primary_key=True)
     employee_number = db.Column(db.String(50), unique=True, nullable=True)
@@ -61,7 +81,7 @@ class Employee(db.Model):
     # anmelden. Dafür wird ein eindeutiger Benutzername sowie ein
     # gehashter Passwortstring gespeichert. Die Rolle "is_admin"
     # kennzeichnet Administratoren, die erweiterte Rechte besitzen.
-    username = db.Column(db.String(120), unique=True, nullable=True)
+    username = db.Column(db.String(120), nullable=True)
     password_hash = db.Column(db.String(200), nullable=True)
     is_admin = db.Column(db.Boolean, default=False)
 
@@ -114,6 +134,14 @@ class Shift(db.Model):
     """
 
     __tablename__ = "shift"
+    __table_args__ = (
+        # Erlaubt einen direkten Index-Seek für "nächster genehmigter Einsatz".
+        db.Index("ix_shift_approved_date_id", "approved", "date", "id"),
+        # Für Stundenauswertungen einzelner Mitarbeiter über einen Zeitraum.
+        db.Index("ix_shift_emp_date_approved", "employee_id", "date", "approved"),
+        # Für reine Datumsbereiche wie im Dienstplan (unabhängig vom Status).
+        db.Index("ix_shift_date_approved_emp", "date", "approved", "employee_id"),
+    )
 
     id = db.Column(db.Integer, primary_key=True)
     employee_id = db.Column(db.Integer, db.ForeignKey("employee.id"), nullable=False)
@@ -137,6 +165,12 @@ class Leave(db.Model):
     """
 
     __tablename__ = "leave"
+    __table_args__ = (
+        # Deckt die Überlappungsabfrage genehmigter Abwesenheiten im Monatsbericht ab.
+        db.Index("ix_leave_approved_dates_emp", "approved", "start_date", "end_date", "employee_id"),
+        # Für Auswertungen einer Abwesenheitsart nach Beginn (z.B. Krankheitstage im Monat).
+        db.Index("ix_leave_type_start_emp", "leave_type", "start_date", "employee_id"),
+    )
 
     id = db.Column(db.Integer, primary_key=True)
     employee_id = db.Column(db.Integer, db.ForeignKey("employee.id"), nullable=False)
@@ -178,6 +212,18 @@ class WorkClass(db.Model):
     """Beschreibt eine Arbeitszeit-Klassifikation wie Vollzeit oder Teilzeit."""
 
     __tablename__ = "work_class"
+    __table_args__ = (
+        # Für die Namensprüfung ohne Beachtung der Groß-/Kleinschreibung.
+        db.Index("ix_work_class_lower_name", db.func.lower(text("name"))),
+        # Höchstens eine Arbeitsklasse darf als Standard markiert sein.
+        db.Index(
+            "ux_work_class_single_default",
+            "is_default",
+            unique=True,
+            sqlite_where=text("is_default = 1"),
+            postgresql_where=text("is_default"),
+        ),
+    )
 
     id = db.Column(db.Integer, primary_key=True)
     name = db.Column(db.String(120), nullable=False, unique=True)
@@ -241,6 +287,10 @@ class ApprovalAutomation(db.Model):
     """Zeitgesteuerte Automatisierungen für Genehmigungsprozesse."""
 
     __tablename__ = "approval_automation"
+    __table_args__ = (
+        # Für die Suche nach fälligen Automatisierungen (Hintergrund-Thread und Übersicht).
+        db.Index("ix_approval_automation_active_next_run", "is_active", "next_run"),
+    )
 
     id = db.Column(db.Integer, primary_key=True)
     name = db.Column(db.String(120), nullable=False)
@@ -333,6 +383,27 @@ def _upgrade_schema_if_needed() -> None:
                     continue
 
 
+def _create_missing_indexes() -> None:
+    """Legt in den Modellen deklarierte Indizes auch in bestehenden Datenbanken an.
+
+    ``db.create_all`` erzeugt Indizes nur zusammen mit neuen Tabellen. Für
+    ältere Installationen werden fehlende Indizes hier nachgezogen.
+    """
+
+    engine = db.engine
+    for table in db.metadata.sorted_tables:
+        for index in table.indexes:
+            # IF NOT EXISTS statt checkfirst: Ausdrucksindizes (z.B. auf
+            # lower(name)) lassen sich nicht reflektieren.
+            try:
+                with engine.begin() as connection:
+                    connection.execute(CreateIndex(index, if_not_exists=True))
+            except IntegrityError:
+                # Ein eindeutiger Index, der wegen doppelter Altdaten nicht
+                # angelegt werden kann, darf den Start nicht verhindern.
+                continue
+
+
 def init_db(app):
     """Initialisiert die Datenbank.
 
@@ -344,6 +415,7 @@ def init_db(app):
     with app.app_context():
         db.create_all()
         _upgrade_schema_if_needed()
+        _create_missing_indexes()
 
 
 